@@ -19,8 +19,8 @@ from src.img_enhance.utils import (
     get_supported_formats
 )
 
-def parse_args():
-    """Parse command-line arguments"""
+def parse_args(args=None):
+    """Parse command-line arguments (defaults to sys.argv[1:])"""
     parser = argparse.ArgumentParser(description='Image Enhancement for OCR')
     
     # Create subparsers for different modes
@@ -71,7 +71,7 @@ def parse_args():
     preview_parser.add_argument('input_path', help='Input image path')
     preview_parser.add_argument('--output-path', '-o', required=True, help='Output image path')
     
-    return parser.parse_args()
+    return parser.parse_args(args)
 
 def get_image_paths(input_path: str, recursive: bool = False) -> List[str]:
     """
@@ -3,7 +3,6 @@ import os
 from typing import List, Tuple, Dict, Any, Union, Optional
 import json
 from .enhancer import EnhancementParams
-import matplotlib.pyplot as plt
 import numpy as np
 
 def save_params_to_json(params: EnhancementParams, output_path: str) -> None:
@@ -145,6 +144,9 @@ def plot_enhancement_metrics(original_image: Union[str, Image.Image],
         show_plot: Whether to display the plot
         save_path: Optional path to save the plot
     """
+    # pyplot is slow to import, so only load it when a plot is requested
+    import matplotlib.pyplot as plt
+    
     # Load images if paths are provided
     if isinstance(original_image, str):
         original = Image.open(original_image).convert('RGB')
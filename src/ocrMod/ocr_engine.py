@@ -4,60 +4,454 @@ This module handles text extraction using the Tesseract engine.
 """
 
 import os
-import pytesseract
-from PIL import Image
-from typing import Optional, Union, Dict
+import hashlib
+import multiprocessing
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union, Dict, List, Callable, Tuple
+
+# pytesseract (which pulls in numpy) and PIL.Image are imported on first use
+# by _load_dependencies, keeping this module cheap to import. They stay module attributes so tests can patch them.
+pytesseract = None
+Image = None
+
+# tesserocr is optional; it keeps Tesseract loaded in-process between calls.
+# It loads PIL and libtesseract itself, so it is only imported for engines
+# created with use_tesserocr=True, and stays None when not installed.
+PyTessBaseAPI = None
+
+
+def _load_dependencies(tesserocr: bool = False) -> None:
+    """
+    Import pytesseract and PIL.Image if they have not been loaded yet.
+    
+    Args:
+        tesserocr: Also try to import tesserocr's PyTessBaseAPI
+    """
+    global pytesseract, Image, PyTessBaseAPI
+    if pytesseract is None:
+        import pytesseract as _pytesseract
+        pytesseract = _pytesseract
+    if Image is None:
+        from PIL import Image as _Image
+        Image = _Image
+    if tesserocr and PyTessBaseAPI is None:
+        try:
+            from tesserocr import PyTessBaseAPI as _PyTessBaseAPI
+        except ImportError:
+            return
+        PyTessBaseAPI = _PyTessBaseAPI
+
+
+# pytesseract calls for each output format, taking (image, lang, config).
+# pytesseract is looked up on every call so tests can patch the module.
+def _handle_text(image, lang: str, config: str) -> str:
+    return pytesseract.image_to_string(image, lang=lang, config=config)
+
+
+def _handle_hocr(image, lang: str, config: str) -> bytes:
+    return pytesseract.image_to_pdf_or_hocr(image, lang=lang, extension='hocr', config=config)
+
+
+def _handle_pdf(image, lang: str, config: str) -> bytes:
+    return pytesseract.image_to_pdf_or_hocr(image, lang=lang, extension='pdf', config=config)
+
+
+def _handle_tsv(image, lang: str, config: str) -> str:
+    return pytesseract.image_to_data(image, lang=lang, config=config)
+
+
+def _handle_alto(image, lang: str, config: str) -> bytes:
+    return pytesseract.image_to_alto_xml(image, lang=lang, config=config)
+
+
+def _handle_page(image, lang: str, config: str) -> str:
+    # Note: Assuming pytesseract has this function (it might need custom implementation)
+    # This is a placeholder for the PAGE format
+    return pytesseract.image_to_string(image, lang=lang, config=f"{config} outputformat page")
+
+
+# Maps lower-case output format names to their handler
+_FORMAT_HANDLERS: Dict[str, Callable] = {
+    'text': _handle_text,
+    'hocr': _handle_hocr,
+    'pdf': _handle_pdf,
+    'tsv': _handle_tsv,
+    'alto': _handle_alto,
+    'page': _handle_page,
+}
+
+
+def _parse_tesserocr_config(config: str) -> Optional[Dict[str, int]]:
+    """
+    Parse a config string made only of --oem/--psm options for tesserocr.
+    
+    Returns:
+        Mapping of option name ('oem', 'psm') to value, or None if the config
+        contains anything tesserocr cannot apply
+    """
+    tokens = config.split()
+    if len(tokens) % 2:
+        return None
+    
+    options = {}
+    for flag, value in zip(tokens[::2], tokens[1::2]):
+        if flag not in ('--oem', '--psm') or not value.isdigit():
+            return None
+        options[flag[2:]] = int(value)
+    return options
+
+
+# Formats Tesseract (Leptonica) reads directly from a path
+_TESSERACT_NATIVE_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.gif',
+    '.pbm', '.pgm', '.ppm', '.pnm'
+}
+
+
+def _needs_pil_decode(image_path: str) -> bool:
+    """Check whether an image file must be decoded by Pillow before OCR."""
+    return Path(image_path).suffix.lower() not in _TESSERACT_NATIVE_EXTENSIONS
+
+
+def _end_apis(apis: Dict) -> None:
+    """End and forget every tesserocr API in a mapping."""
+    while apis:
+        # popitem is atomic, so each API is ended exactly once
+        _, api = apis.popitem()
+        api.End()
+
+
+class _ThreadAPIs:
+    """
+    tesserocr APIs created by one thread, keyed by (language, engine mode).
+    
+    Instances live in thread-local storage, so they are dropped when their
+    thread exits; the APIs are ended then, or at interpreter exit.
+    """
+    
+    def __init__(self):
+        self.apis: Dict[Tuple[str, Optional[int]], "PyTessBaseAPI"] = {}
+        weakref.finalize(self, _end_apis, self.apis)
+
+
+# Engine that runs OCR in a process_images_mp worker process
+_worker_engine = None
+
+
+def _worker_init(settings: Dict) -> None:
+    """Build the worker process's engine from the parent engine's settings."""
+    global _worker_engine
+    _worker_engine = OCREngine(**settings)
+
+
+def _ocr_one(job: Tuple[str, str, str, str]) -> Union[str, Dict]:
+    """Run OCR for one (image_path, lang, output_format, config) job in a worker."""
+    return _worker_engine.process_image(*job)
 
 
 class OCREngine:
     """
     OCR Engine class that provides methods to extract text from images using Tesseract.
     """
+    # LSTM engine only (skips loading the legacy engine), one uniform text block
+    DEFAULT_CONFIG = "--oem 1 --psm 6"
     
-    def __init__(self, tesseract_cmd: Optional[str] = None):
+    # LSTM engine only, find as much scattered text as possible
+    SPARSE_TEXT_CONFIG = "--oem 1 --psm 11"
+    
+    def __init__(self,
+                 tesseract_cmd: Optional[str] = None,
+                 use_tesserocr: bool = False,
+                 cache_size: int = 0,
+                 max_pixels: Optional[int] = None,
+                 allow_downsample: bool = True,
+                 default_config: Optional[str] = None,
+                 sparse_text: bool = False):
         """
         Initialize the OCR engine.
         
         Args:
             tesseract_cmd: Path to the tesseract executable. If None, uses default.
+            use_tesserocr: Run plain-text extraction through a persistent
+                tesserocr API instead of spawning a tesseract process per call
+            cache_size: Number of results to memoize by image content hash
+                (0 disables caching)
+            max_pixels: Largest image area (width * height) passed to Tesseract
+                from process_image; None disables the limit
+            allow_downsample: Shrink images over max_pixels instead of raising
+                ValueError
+            default_config: Tesseract configuration used when a call passes no
+                config (default: DEFAULT_CONFIG)
+            sparse_text: Use SPARSE_TEXT_CONFIG as the default configuration,
+                for images with scattered text rather than paragraphs
+                
+        Raises:
+            ValueError: If both sparse_text and default_config are given
         """
+        _load_dependencies(tesserocr=use_tesserocr)
+        self.tesseract_cmd = tesseract_cmd
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        
+        if use_tesserocr and PyTessBaseAPI is None:
+            raise ImportError("use_tesserocr=True requires the tesserocr package")
+        self.use_tesserocr = use_tesserocr
+        
+        # tesserocr APIs are not thread-safe, so each thread keeps its own,
+        # created on first use. The per-thread sets are also tracked weakly
+        # so close() can release them all.
+        self._local = threading.local()
+        self._thread_apis: "weakref.WeakSet[_ThreadAPIs]" = weakref.WeakSet()
+        self._apis_lock = threading.Lock()
+        
+        # Worker threads for process_images, kept between batches so each
+        # worker's tesserocr APIs are reused instead of recreated
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
+        self._executor_lock = threading.Lock()
+        
+        # Worker processes for process_images_mp, created on first use
+        self._pool: Optional["multiprocessing.pool.Pool"] = None
+        self._pool_workers = 0
+        self._pool_finalizer: Optional[weakref.finalize] = None
+        self._pool_lock = threading.Lock()
+        
+        # LRU cache of results keyed by (content hash, lang, format, config)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, Union[str, Dict]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        self.max_pixels = max_pixels
+        self.allow_downsample = allow_downsample
+        
+        if sparse_text and default_config is not None:
+            raise ValueError("sparse_text and default_config cannot be combined")
+        if default_config is None:
+            default_config = self.SPARSE_TEXT_CONFIG if sparse_text else self.DEFAULT_CONFIG
+        self.default_config = default_config
+    
+    def __enter__(self) -> "OCREngine":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """
+        Release the workers, tesserocr APIs and cached results held by the engine.
+        
+        Waits for running process_images batches to finish. Must not be called
+        while other threads are inside the engine's other methods. The engine
+        stays usable; workers and APIs are created again on the next call.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        
+        with self._pool_lock:
+            pool_finalizer, self._pool_finalizer = self._pool_finalizer, None
+            self._pool = None
+        if pool_finalizer is not None:
+            pool_finalizer()
+        
+        with self._apis_lock:
+            thread_apis = list(self._thread_apis)
+            self._local = threading.local()
+        for entry in thread_apis:
+            _end_apis(entry.apis)
+        
+        with self._cache_lock:
+            self._cache.clear()
     
     def process_image(self, 
-                      image_path: str, 
+                      image_path: Union[str, os.PathLike], 
                       lang: str = 'eng',
                       output_format: str = 'text',
-                      config: str = '') -> Union[str, Dict]:
+                      config: Optional[str] = None,
+                      preprocess: bool = False) -> Union[str, Dict]:
         """
         Process an image and extract text using Tesseract OCR.
         
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file (str or os.PathLike)
             lang: Language(s) to use for OCR (default: 'eng')
             output_format: Output format ('text', 'hocr', 'pdf', 'tsv', 'alto', 'page')
             config: Additional configuration parameters for Tesseract
+                (default: the engine's default_config)
+            preprocess: Convert to grayscale, smooth and binarize the image with
+                OpenCV before OCR
             
         Returns:
             Extracted text or data in the specified format
         """
-        # Validate file exists
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image file not found: {image_path}")
+        # pytesseract only passes str paths through to Tesseract
+        image_path = os.fspath(image_path)
+        if config is None:
+            config = self.default_config
         
-        # Open the image
-        image = Image.open(image_path)
+        def run() -> Union[str, Dict]:
+            source = self._load_image(image_path, preprocess)
+            return self._extract_text(source, lang, output_format, config)
         
-        # Process with tesseract based on requested output format
-        result = self._extract_text(image, lang, output_format, config)
+        # The cache is keyed by the file contents, so a hit skips decoding,
+        # downsampling and preprocessing as well as OCR
+        if self.cache_size:
+            try:
+                with open(image_path, 'rb') as f:
+                    digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Image file not found: {image_path}") from None
+            return self._cached((digest, lang, output_format, config, preprocess), run)
         
-        return result
+        return run()
+    
+    async def process_image_async(self, *args, **kwargs) -> Union[str, Dict]:
+        """
+        Asynchronous version of process_image.
+        
+        OCR runs in the event loop's default thread pool, so awaiting this
+        does not block the loop and concurrent calls run in parallel.
+        
+        Args:
+            Same as process_image
+            
+        Returns:
+            Extracted text or data in the specified format
+        """
+        # Imported here to keep it out of synchronous callers' start-up;
+        # a running event loop has loaded it already
+        import asyncio
+        return await asyncio.to_thread(self.process_image, *args, **kwargs)
+    
+    def process_images(self,
+                       image_paths: List[str],
+                       lang: str = 'eng',
+                       output_format: str = 'text',
+                       config: Optional[str] = None,
+                       max_workers: Optional[int] = None) -> List[Union[str, Dict]]:
+        """
+        Process several images concurrently using a thread pool.
+        
+        Tesseract does its work outside the GIL (in a subprocess, or inside
+        tesserocr), so worker threads run OCR in parallel. The pool is kept
+        until close() or a call with a different max_workers, so tesserocr
+        APIs stay loaded between batches.
+        
+        Args:
+            image_paths: Paths to the image files
+            lang: Language(s) to use for OCR (default: 'eng')
+            output_format: Output format ('text', 'hocr', 'pdf', 'tsv', 'alto', 'page')
+            config: Additional configuration parameters for Tesseract
+                (default: the engine's default_config)
+            max_workers: Number of worker threads (default: os.cpu_count())
+            
+        Returns:
+            Results in the same order as image_paths
+        """
+        # map() submits every path before returning, so the pool cannot be
+        # replaced by another thread while this batch is being queued
+        with self._executor_lock:
+            results = self._get_executor(max_workers or os.cpu_count()).map(
+                lambda path: self.process_image(path, lang, output_format, config),
+                image_paths
+            )
+        return list(results)
+    
+    def process_images_mp(self,
+                          image_paths: List[str],
+                          lang: str = 'eng',
+                          output_format: str = 'text',
+                          config: Optional[str] = None,
+                          max_workers: Optional[int] = None) -> List[Union[str, Dict]]:
+        """
+        Process several images on a pool of worker processes.
+        
+        Unlike process_images, the pytesseract wrapper work (temp files,
+        output parsing) also runs outside this process. Each worker runs
+        process_image on an engine built from this engine's tesseract_cmd,
+        tesserocr, max_pixels and default_config settings as they were when
+        the pool was created; results are not cached. The pool is kept until
+        close() or a call with a different max_workers.
+        
+        Workers are started with the 'spawn' method, so scripts calling this
+        must guard their entry point with if __name__ == '__main__'.
+        
+        Args:
+            image_paths: Paths to the image files
+            lang: Language(s) to use for OCR (default: 'eng')
+            output_format: Output format ('text', 'hocr', 'pdf', 'tsv', 'alto', 'page')
+            config: Additional configuration parameters for Tesseract
+                (default: the engine's default_config)
+            max_workers: Number of worker processes (default: os.cpu_count())
+            
+        Returns:
+            Results in the same order as image_paths
+        """
+        # Fail here rather than inside a worker
+        if output_format.lower() not in _FORMAT_HANDLERS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        
+        if config is None:
+            config = self.default_config
+        
+        jobs = [(path, lang, output_format, config) for path in image_paths]
+        
+        # Each batch already uses every worker, so batches from several
+        # threads run one after another rather than racing to resize the pool
+        with self._pool_lock:
+            return self._get_pool(max_workers or os.cpu_count()).map(_ocr_one, jobs, chunksize=4)
+    
+    def process_image_list(self,
+                           image_paths: List[str],
+                           lang: str = 'eng',
+                           config: Optional[str] = None,
+                           batch_size: int = 50) -> str:
+        """
+        Extract text from many images with one tesseract run per batch.
+        
+        Tesseract reads a text file listing image paths and processes them all
+        in a single process, so start-up and model loading happen once per
+        batch instead of once per image. Batches are kept small because
+        tesseract can hang on very long lists.
+        
+        Args:
+            image_paths: Paths to the image files (relative paths resolve
+                against the current working directory)
+            lang: Language(s) to use for OCR (default: 'eng')
+            config: Additional configuration parameters for Tesseract
+                (default: the engine's default_config)
+            batch_size: Maximum number of images per tesseract run
+            
+        Returns:
+            Extracted text of all images, each page terminated by a form feed
+        """
+        if config is None:
+            config = self.default_config
+        
+        outputs = []
+        with tempfile.TemporaryDirectory() as list_dir:
+            for start in range(0, len(image_paths), batch_size):
+                with tempfile.NamedTemporaryFile('w', suffix='.txt', dir=list_dir,
+                                                 delete=False) as list_file:
+                    list_file.write("\n".join(image_paths[start:start + batch_size]))
+                
+                # Tesseract terminates every page with a form feed, so the
+                # batch outputs can simply be concatenated
+                outputs.append(pytesseract.image_to_string(list_file.name, lang=lang, config=config))
+        
+        return "".join(outputs)
     
     def process_pil_image(self,
-                         image: Image.Image,
+                         image: "Image.Image",
                          lang: str = 'eng',
                          output_format: str = 'text',
-                         config: str = '') -> Union[str, Dict]:
+                         config: Optional[str] = None) -> Union[str, Dict]:
         """
         Process a PIL Image object directly and extract text using Tesseract OCR.
         
@@ -66,17 +460,166 @@ class OCREngine:
             lang: Language(s) to use for OCR (default: 'eng')
             output_format: Output format ('text', 'hocr', 'pdf', 'tsv', 'alto', 'page')
             config: Additional configuration parameters for Tesseract
+                (default: the engine's default_config)
             
         Returns:
             Extracted text or data in the specified format
         """
+        if config is None:
+            config = self.default_config
+        
+        if self.cache_size:
+            digest = hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+            return self._cached(
+                (digest, image.mode, image.size, lang, output_format, config),
+                lambda: self._extract_text(image, lang, output_format, config)
+            )
+        
         # Process with tesseract based on requested output format
         result = self._extract_text(image, lang, output_format, config)
         
         return result
     
+    async def process_pil_image_async(self, *args, **kwargs) -> Union[str, Dict]:
+        """
+        Asynchronous version of process_pil_image.
+        
+        Args:
+            Same as process_pil_image
+            
+        Returns:
+            Extracted text or data in the specified format
+        """
+        import asyncio
+        return await asyncio.to_thread(self.process_pil_image, *args, **kwargs)
+    
+    def _load_image(self, image_path: str, preprocess: bool) -> Union[str, "Image.Image"]:
+        """
+        Prepare an image file for OCR.
+        
+        Args:
+            image_path: Path to the image file
+            preprocess: Clean up the image with OpenCV
+            
+        Returns:
+            image_path if Tesseract can read the file as is, otherwise a PIL Image
+        """
+        # Tesseract decodes common formats itself, so those paths are passed
+        # through without a Pillow decode unless they have to be shrunk first.
+        # Either way the file is touched once here, which also validates it.
+        try:
+            if self.max_pixels:
+                source = self._fit_to_max_pixels(image_path)
+            else:
+                os.stat(image_path)
+                source = image_path
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Image file not found: {image_path}") from None
+        
+        if preprocess:
+            source = self._preprocess(source)
+        elif isinstance(source, str) and _needs_pil_decode(source):
+            source = Image.open(source)
+        
+        return source
+    
+    def _preprocess(self, image: Union[str, "Image.Image"]) -> "Image.Image":
+        """
+        Clean up an image for OCR with OpenCV.
+        
+        Grayscale conversion, an edge-preserving bilateral filter and Otsu
+        thresholding leave Tesseract a clean black-on-white image, which is
+        both more accurate and faster to recognize.
+        
+        Args:
+            image: Image file path or PIL Image object
+            
+        Returns:
+            Binarized PIL Image
+        """
+        # Imported here so OpenCV is only loaded when preprocessing is used
+        import cv2
+        import numpy as np
+        
+        if isinstance(image, str):
+            array = cv2.imread(image)
+            if array is None:
+                raise ValueError(f"Could not read image: {image}")
+        else:
+            array = cv2.cvtColor(np.asarray(image.convert('RGB')), cv2.COLOR_RGB2BGR)
+        
+        gray = cv2.cvtColor(array, cv2.COLOR_BGR2GRAY)
+        gray = cv2.bilateralFilter(gray, 5, 75, 75)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        return Image.fromarray(binary)
+    
+    def _fit_to_max_pixels(self, image_path: str) -> Union[str, "Image.Image"]:
+        """
+        Check an image file against max_pixels, shrinking it if necessary.
+        
+        Only the file header is read for images within the limit. Larger
+        images are decoded at reduced size.
+        
+        Args:
+            image_path: Path to the image file
+            
+        Returns:
+            image_path if the image is within the limit, otherwise a
+            downsampled PIL Image
+            
+        Raises:
+            ValueError: If the image is too large and downsampling is disabled
+        """
+        # Image.open only parses the header; pixel data is decoded on load()
+        image = Image.open(image_path)
+        width, height = image.size
+        if width * height <= self.max_pixels:
+            image.close()
+            return image_path
+        
+        if not self.allow_downsample:
+            image.close()
+            raise ValueError(
+                f"Image exceeds max_pixels ({width}x{height} > {self.max_pixels}): {image_path}"
+            )
+        
+        scale = (self.max_pixels / (width * height)) ** 0.5
+        target_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        
+        # draft() lets the JPEG decoder scale by 1/2, 1/4 or 1/8 while decoding
+        # (a no-op for other formats); Tesseract works in grayscale anyway
+        image.draft('L', target_size)
+        image.thumbnail(target_size)
+        return image
+    
+    def _cached(self, key: Tuple, compute: Callable[[], Union[str, Dict]]) -> Union[str, Dict]:
+        """
+        Return the cached result for key, computing and storing it on a miss.
+        
+        Args:
+            key: Cache key starting with the image content hash
+            compute: Function that runs OCR for the image
+            
+        Returns:
+            Extracted text or data in the specified format
+        """
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        
+        # Run OCR outside the lock so other threads are not blocked
+        result = compute()
+        
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return result
+    
     def _extract_text(self, 
-                     image: Image.Image, 
+                     image: Union[str, "Image.Image"], 
                      lang: str, 
                      output_format: str, 
                      config: str) -> Union[str, Dict]:
@@ -84,7 +627,7 @@ class OCREngine:
         Extract text from image using the appropriate tesseract method.
         
         Args:
-            image: PIL Image object
+            image: Image file path or PIL Image object
             lang: Language(s) for OCR
             output_format: Output format
             config: Additional tesseract configuration
@@ -92,19 +635,108 @@ class OCREngine:
         Returns:
             Extracted text or data in the specified format
         """
-        if output_format.lower() == 'text':
-            return pytesseract.image_to_string(image, lang=lang, config=config)
-        elif output_format.lower() == 'hocr':
-            return pytesseract.image_to_pdf_or_hocr(image, lang=lang, extension='hocr', config=config)
-        elif output_format.lower() == 'pdf':
-            return pytesseract.image_to_pdf_or_hocr(image, lang=lang, extension='pdf', config=config)
-        elif output_format.lower() == 'tsv':
-            return pytesseract.image_to_data(image, lang=lang, config=config)
-        elif output_format.lower() == 'alto':
-            return pytesseract.image_to_alto_xml(image, lang=lang, config=config)
-        elif output_format.lower() == 'page':
-            # Note: Assuming pytesseract has this function (it might need custom implementation)
-            # This is a placeholder for the PAGE format
-            return pytesseract.image_to_string(image, lang=lang, config=f"{config} outputformat page")
-        else:
-            raise ValueError(f"Unsupported output format: {output_format}") 
\ No newline at end of file
+        fmt = output_format.lower()
+        
+        # tesserocr can only apply engine and page segmentation modes, so
+        # calls with any other options fall through to pytesseract. hOCR does
+        # too: GetHOCRText returns only the page <div>, not the full document
+        # Tesseract's hOCR renderer (and so pytesseract) produces.
+        options = _parse_tesserocr_config(config) if self.use_tesserocr else None
+        if options is not None and fmt == 'text':
+            api = self._get_api(lang, options.get('oem'))
+            # 3 (fully automatic segmentation) is Tesseract's own default
+            api.SetPageSegMode(options.get('psm', 3))
+            if isinstance(image, str):
+                api.SetImageFile(image)
+            else:
+                api.SetImage(image)
+            return api.GetUTF8Text()
+        
+        handler = _FORMAT_HANDLERS.get(fmt)
+        if handler is None:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        return handler(image, lang, config)
+    
+    def _get_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        """
+        Get the worker thread pool, replacing it if the worker count changed.
+        
+        Must be called with _executor_lock held.
+        
+        Args:
+            max_workers: Number of worker threads
+            
+        Returns:
+            Thread pool with max_workers threads
+        """
+        if self._executor is None or self._executor_workers != max_workers:
+            if self._executor is not None:
+                # The old workers exit, which ends their tesserocr APIs
+                self._executor.shutdown()
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._executor_workers = max_workers
+        return self._executor
+    
+    def _get_pool(self, processes: int) -> "multiprocessing.pool.Pool":
+        """
+        Get the worker process pool, replacing it if the worker count changed.
+        
+        Must be called with _pool_lock held.
+        
+        Args:
+            processes: Number of worker processes
+            
+        Returns:
+            Process pool whose workers each hold an engine with this engine's settings
+        """
+        if self._pool is None or self._pool_workers != processes:
+            if self._pool_finalizer is not None:
+                self._pool_finalizer()
+            
+            settings = {
+                'tesseract_cmd': self.tesseract_cmd or pytesseract.pytesseract.tesseract_cmd,
+                'use_tesserocr': self.use_tesserocr,
+                'max_pixels': self.max_pixels,
+                'allow_downsample': self.allow_downsample,
+                'default_config': self.default_config,
+            }
+            # Forking a process that is running threads (process_images
+            # workers, tesserocr) can leave the child with locks held forever
+            self._pool = multiprocessing.get_context('spawn').Pool(
+                processes=processes,
+                initializer=_worker_init,
+                initargs=(settings,),
+                maxtasksperchild=256
+            )
+            self._pool_workers = processes
+            # Stop the workers if the engine is dropped without close()
+            self._pool_finalizer = weakref.finalize(self, self._pool.terminate)
+        return self._pool
+    
+    def _get_api(self, lang: str, oem: Optional[int] = None) -> "PyTessBaseAPI":
+        """
+        Get the tesserocr API for a language and engine mode, initializing it on first use.
+        
+        The API is private to the calling thread.
+        
+        Args:
+            lang: Language(s) for OCR
+            oem: OCR engine mode, or None for Tesseract's default
+            
+        Returns:
+            Initialized PyTessBaseAPI instance
+        """
+        thread_apis = getattr(self._local, 'apis', None)
+        if thread_apis is None:
+            thread_apis = self._local.apis = _ThreadAPIs()
+            with self._apis_lock:
+                self._thread_apis.add(thread_apis)
+        
+        api = thread_apis.apis.get((lang, oem))
+        if api is None:
+            if oem is None:
+                api = PyTessBaseAPI(lang=lang)
+            else:
+                api = PyTessBaseAPI(lang=lang, oem=oem)
+            thread_apis.apis[(lang, oem)] = api
+        return api
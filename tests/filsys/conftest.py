@@ -9,6 +9,10 @@ from pathlib import Path
 # Add the src directory to the Python path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+# Render offscreen unless a platform was chosen, so headless runs (CI, xdist
+# workers) fail or pass instead of waiting for a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
 # Import PyQt6 for QApplication
 from PyQt6.QtWidgets import QApplication
 
@@ -33,8 +33,8 @@ class TestFileSystemDemo:
         """Test initialization of FileSystemDemo."""
         assert isinstance(demo, QMainWindow)
         assert demo.windowTitle() == "File System Handler Demo"
-        assert demo.minimumSize().width() >= 600
-        assert demo.minimumSize().height() >= 400
+        size = demo.minimumSize()
+        assert size.width() >= 600 and size.height() >= 400
         assert demo.file_handler is not None
         assert demo.selected_file is None
     
@@ -2,14 +2,14 @@ import sys
 import os
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 # Add the src directory to the Python path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from PyQt6.QtWidgets import QApplication, QListWidgetItem
 from PyQt6.QtCore import Qt
-from PyQt6.QtTest import QTest
+from PyQt6.QtTest import QTest, QSignalSpy
 
 from src.filsys.file_handler import FileSystemHandler, FileSelectionDialog, SaveFileDialog
 
@@ -47,8 +47,8 @@ class TestFileSelectionDialog:
         assert dialog.file_handler == file_handler
         assert dialog.selected_file is None
         assert dialog.windowTitle() == "Select Image File"
-        assert dialog.minimumSize().width() >= 600
-        assert dialog.minimumSize().height() >= 400
+        size = dialog.minimumSize()
+        assert size.width() >= 600 and size.height() >= 400
     
     def test_setup_ui(self, dialog):
         """Test that the UI is set up correctly."""
@@ -84,8 +84,7 @@ class TestFileSelectionDialog:
         assert dialog.selected_file == '/path/to/selected/image.png'
         
         # Check that the signal was emitted
-        assert len(signal_spy) == 1
-        assert signal_spy[0][0] == '/path/to/selected/image.png'
+        assert list(signal_spy) == [['/path/to/selected/image.png']]
     
     @patch('src.filsys.file_handler.FileSystemHandler.select_image_file')
     def test_on_browse_clicked_canceled(self, mock_select, dialog):
@@ -106,17 +105,16 @@ class TestFileSelectionDialog:
         assert dialog.selected_file is None
         
         # Check that the signal was not emitted
-        assert len(signal_spy) == 0
+        assert list(signal_spy) == []
     
-    @patch('os.path.isfile')
-    def test_on_recent_file_selected_exists(self, mock_isfile, dialog):
+    def test_on_recent_file_selected_exists(self, fs, dialog):
         """Test selecting a file from the recent files list that exists."""
-        # Mock os.path.isfile to return True
-        mock_isfile.return_value = True
+        # Create the file on the fake filesystem so os.path.isfile finds it
+        fs.create_file('/path/to/recent1.png')
         
-        # Create a mock item
-        item = MagicMock(spec=QListWidgetItem)
-        item.data.return_value = '/path/to/recent1.png'
+        # Create a list item pointing at the file
+        item = QListWidgetItem('recent1.png')
+        item.setData(Qt.ItemDataRole.UserRole, '/path/to/recent1.png')
         
         # Create a spy for the file_selected signal
         signal_spy = QSignalSpy(dialog.file_selected)
@@ -128,26 +126,16 @@ class TestFileSelectionDialog:
         assert dialog.selected_file == '/path/to/recent1.png'
         
         # Check that the signal was emitted
-        assert len(signal_spy) == 1
-        assert signal_spy[0][0] == '/path/to/recent1.png'
+        assert list(signal_spy) == [['/path/to/recent1.png']]
     
-    @patch('os.path.isfile')
     @patch('PyQt6.QtWidgets.QMessageBox.warning')
-    def test_on_recent_file_selected_not_exists(self, mock_warning, mock_isfile, dialog):
+    def test_on_recent_file_selected_not_exists(self, mock_warning, fs, dialog):
         """Test selecting a file from the recent files list that doesn't exist."""
-        # Mock os.path.isfile to return False
-        mock_isfile.return_value = False
+        # The file is never created on the fake filesystem
+        item = dialog.recent_list.item(0)
         
-        # Create a mock item
-        item = MagicMock(spec=QListWidgetItem)
-        item.data.return_value = '/path/to/nonexistent.png'
-        
-        # Mock the list widget's row method
-        dialog.recent_list = MagicMock()
-        dialog.recent_list.row.return_value = 0
-        
-        # Add the nonexistent file to the recent files
-        dialog.file_handler.recent_files.append('/path/to/nonexistent.png')
+        # Create a spy for the file_selected signal
+        signal_spy = QSignalSpy(dialog.file_selected)
         
         # Call the method
         dialog._on_recent_file_selected(item)
@@ -156,10 +144,15 @@ class TestFileSelectionDialog:
         mock_warning.assert_called_once()
         
         # Check that the file was removed from recent files
-        assert '/path/to/nonexistent.png' not in dialog.file_handler.recent_files
+        assert '/path/to/recent1.png' not in dialog.file_handler.recent_files
         
         # Check that the item was removed from the list
-        dialog.recent_list.takeItem.assert_called_once_with(0)
+        assert dialog.recent_list.count() == 1
+        assert dialog.recent_list.item(0).text() == "recent2.jpg"
+        
+        # Check that the signal was not emitted
+        assert dialog.selected_file is None
+        assert list(signal_spy) == []
 
 
 class TestSaveFileDialog:
@@ -181,8 +174,8 @@ class TestSaveFileDialog:
         assert dialog.selected_file is None
         assert dialog.selected_format == "txt"
         assert dialog.windowTitle() == "Save Output"
-        assert dialog.minimumSize().width() >= 500
-        assert dialog.minimumSize().height() >= 300
+        size = dialog.minimumSize()
+        assert size.width() >= 500 and size.height() >= 300
     
     def test_setup_ui(self, dialog):
         """Test that the UI is set up correctly."""
@@ -225,21 +218,3 @@ class TestSaveFileDialog:
         assert dialog.selected_file is None
         assert dialog.selected_format == "txt"  # Default value
 
-
-# Helper class for testing signals
-class QSignalSpy:
-    """Simple implementation of a signal spy for testing Qt signals."""
-    
-    def __init__(self, signal):
-        self.signal = signal
-        self.args = []
-        self.signal.connect(self.slot)
-    
-    def slot(self, *args):
-        self.args.append(args)
-    
-    def __len__(self):
-        return len(self.args)
-    
-    def __getitem__(self, index):
-        return self.args[index] 
\ No newline at end of file
@@ -1,6 +1,5 @@
 import os
 import sys
-import tempfile
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -10,29 +9,38 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.filsys.file_handler import FileSystemHandler
 
+# Home directory the handler starts in, resolved once for all tests
+_HOME = str(Path.home())
+
 
 class TestFileSystemHandler:
     """Tests for the FileSystemHandler class."""
     
+    @pytest.fixture(scope="module")
+    def parent_mock(self):
+        """Create a mock parent widget shared by all handlers in this module."""
+        return MagicMock()
+    
     @pytest.fixture
-    def handler(self):
+    def handler(self, parent_mock):
         """Create a FileSystemHandler instance with a mock parent."""
-        parent_mock = MagicMock()
+        # The handler mutates recent_files and last_directory, so it stays per-test
         return FileSystemHandler(parent_mock)
     
     @pytest.fixture
-    def temp_files(self):
+    def temp_files(self, tmp_path):
         """Create temporary test files with different extensions."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create test files with different extensions
-            test_files = {}
-            for ext in ['.png', '.jpg', '.jpeg', '.tif', '.tiff', '.txt']:
-                file_path = os.path.join(temp_dir, f'test_file{ext}')
-                with open(file_path, 'w') as f:
-                    f.write('test content')
-                test_files[ext] = file_path
-            
-            yield temp_dir, test_files
+        temp_dir = str(tmp_path)
+        
+        # Create test files with different extensions
+        test_files = {}
+        for ext in ['.png', '.jpg', '.jpeg', '.tif', '.tiff', '.txt']:
+            file_path = os.path.join(temp_dir, f'test_file{ext}')
+            with open(file_path, 'w') as f:
+                f.write('test content')
+            test_files[ext] = file_path
+        
+        return temp_dir, test_files
     
     def test_init(self, handler):
         """Test initialization of FileSystemHandler."""
@@ -40,7 +48,7 @@ class TestFileSystemHandler:
         assert isinstance(handler.recent_files, list)
         assert len(handler.recent_files) == 0
         assert handler.max_recent_files == 10
-        assert handler.last_directory == str(Path.home())
+        assert handler.last_directory == _HOME
     
     def test_validate_file_type_valid_extensions(self, handler, temp_files):
         """Test file type validation with valid extensions."""
@@ -146,7 +154,7 @@ class TestFileSystemHandler:
         assert result is None
         
         # Check that the last directory was not updated
-        assert handler.last_directory == str(Path.home())
+        assert handler.last_directory == _HOME
         
         # Check that no file was added to recent files
         assert len(handler.recent_files) == 0
@@ -209,7 +217,7 @@ class TestFileSystemHandler:
         assert result is None
         
         # Check that the last directory was not updated
-        assert handler.last_directory == str(Path.home())
+        assert handler.last_directory == _HOME
     
     @patch('PyQt6.QtWidgets.QFileDialog.getExistingDirectory')
     def test_select_directory(self, mock_dialog, handler):
@@ -242,4 +250,4 @@ class TestFileSystemHandler:
         assert result is None
         
         # Check that the last directory was not updated
-        assert handler.last_directory == str(Path.home()) 
\ No newline at end of file
+        assert handler.last_directory == _HOME 
\ No newline at end of file
@@ -1,125 +1,140 @@
 import pytest
 import os
-import tempfile
-from pathlib import Path
+import shutil
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import numpy as np
-import shutil
 
-@pytest.fixture
-def test_image_path():
-    """Create a temporary test image file and return its path"""
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-        # Create a simple test image
-        img = Image.new('RGB', (300, 200), color=(240, 240, 240))
-        draw = ImageDraw.Draw(img)
-        
-        # Draw some text
-        try:
-            font = ImageFont.truetype("Arial", 20)
-        except IOError:
-            font = ImageFont.load_default()
-            
-        draw.text((50, 50), "Test Image", fill=(0, 0, 0), font=font)
-        draw.text((50, 100), "For OCR Testing", fill=(0, 0, 0), font=font)
-        
-        # Draw some shapes
-        draw.rectangle([200, 50, 250, 100], outline=(0, 0, 0))
-        draw.line([50, 150, 250, 150], fill=(0, 0, 0), width=2)
-        
-        # Save the image
-        img.save(tmp.name)
-        
-    yield tmp.name
+# Headless matplotlib backend (no GUI setup, show() is a no-op), chosen before
+# any test module imports matplotlib
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+
+class ImagePath(str):
+    """Path to a fixture image that also carries the image size"""
     
-    # Cleanup
-    if os.path.exists(tmp.name):
-        os.unlink(tmp.name)
+    def __new__(cls, path, size):
+        obj = super().__new__(cls, path)
+        obj.size = size
+        return obj
 
-@pytest.fixture
-def noisy_image_path():
-    """Create a temporary noisy test image file and return its path"""
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-        # Create a simple test image
-        img = Image.new('RGB', (300, 200), color=(240, 240, 240))
-        draw = ImageDraw.Draw(img)
-        
-        # Draw some text
-        try:
-            font = ImageFont.truetype("Arial", 20)
-        except IOError:
-            font = ImageFont.load_default()
-            
-        draw.text((50, 50), "Noisy Image", fill=(0, 0, 0), font=font)
-        draw.text((50, 100), "With Noise", fill=(0, 0, 0), font=font)
-        
-        # Save the image
-        img.save(tmp.name)
-        
-        # Add noise using numpy
-        img_array = np.array(img)
-        noise = np.random.randint(0, 50, img_array.shape, dtype=np.uint8)
-        noisy_array = np.clip(img_array + noise, 0, 255).astype(np.uint8)
+
+@pytest.fixture(scope="session")
+def test_font():
+    """Load the font used to draw text on test images once per session"""
+    try:
+        return ImageFont.truetype("Arial", 20)
+    except IOError:
+        return ImageFont.load_default()
+
+
+# Fixed noise pattern added to the noisy fixture image (300x200 RGB)
+_NOISE = np.random.default_rng(0).integers(0, 50, (200, 300, 3), dtype=np.uint8)
+
+# Background color, text lines and text color for each kind of fixture image
+IMAGE_KINDS = {
+    "standard": ((240, 240, 240), ("Test Image", "For OCR Testing"), (0, 0, 0)),
+    "noisy": ((240, 240, 240), ("Noisy Image", "With Noise"), (0, 0, 0)),
+    "dark": ((50, 50, 50), ("Dark Image", "Low Light"), (150, 150, 150)),
+}
+
+
+@pytest.fixture(scope="session")
+def image_factory(tmp_path_factory, test_font):
+    """Return a callable that writes a test image of the given kind and returns its path"""
+    cache = {}
+    
+    def make(kind="standard"):
+        if kind in cache:
+            return cache[kind]
         
-        # Convert back to PIL image and save
-        noisy_img = Image.fromarray(noisy_array)
-        noisy_img.save(tmp.name)
+        background, lines, text_color = IMAGE_KINDS[kind]
+        path = str(tmp_path_factory.mktemp(f"{kind}_image") / f"{kind}.png")
         
-    yield tmp.name
-    
-    # Cleanup
-    if os.path.exists(tmp.name):
-        os.unlink(tmp.name)
-
-@pytest.fixture
-def dark_image_path():
-    """Create a temporary dark test image file and return its path"""
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
         # Create a simple test image
-        img = Image.new('RGB', (300, 200), color=(50, 50, 50))
+        img = Image.new('RGB', (300, 200), color=background)
         draw = ImageDraw.Draw(img)
         
         # Draw some text
-        try:
-            font = ImageFont.truetype("Arial", 20)
-        except IOError:
-            font = ImageFont.load_default()
-            
-        draw.text((50, 50), "Dark Image", fill=(150, 150, 150), font=font)
-        draw.text((50, 100), "Low Light", fill=(150, 150, 150), font=font)
+        for i, line in enumerate(lines):
+            draw.text((50, 50 + i * 50), line, fill=text_color, font=test_font)
+        
+        if kind == "standard":
+            # Draw some shapes
+            draw.rectangle([200, 50, 250, 100], outline=(0, 0, 0))
+            draw.line([50, 150, 250, 150], fill=(0, 0, 0), width=2)
+        elif kind == "noisy":
+            # Add noise; cv2.add saturates in uint8 without an int64 temporary
+            import cv2
+            img = Image.fromarray(cv2.add(np.asarray(img), _NOISE))
         
-        # Save the image
-        img.save(tmp.name)
+        # Save the image (uncompressed PNG, skips deflate)
+        img.save(path, compress_level=0)
         
-    yield tmp.name
+        cache[kind] = ImagePath(path, img.size)
+        return cache[kind]
     
-    # Cleanup
-    if os.path.exists(tmp.name):
-        os.unlink(tmp.name)
+    return make
+
+
+@pytest.fixture(scope="session")
+def test_image_path(image_factory):
+    """Create a test image file once per session and return its path (with .size)"""
+    return image_factory("standard")
+
+
+@pytest.fixture(scope="session")
+def noisy_image_path(image_factory):
+    """Create a noisy test image file once per session and return its path"""
+    return image_factory("noisy")
+
+
+@pytest.fixture(scope="session")
+def noisy_image(noisy_image_path):
+    """Decode the noisy test image once per session"""
+    return Image.open(noisy_image_path).convert('RGB')
+
+
+@pytest.fixture(scope="session")
+def dark_image_path(image_factory):
+    """Create a dark test image file once per session and return its path"""
+    return image_factory("dark")
+
 
 @pytest.fixture
-def temp_output_dir():
-    """Create a temporary directory for output files"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    
-    # Cleanup
-    shutil.rmtree(temp_dir, ignore_errors=True)
+def temp_output_dir(tmp_path):
+    """Create a temporary directory for output files (cleaned up by pytest)"""
+    return str(tmp_path)
+
+
+def _link_or_copy(src, dst):
+    """Hardlink src to dst, falling back to a copy where links aren't supported"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
 
 @pytest.fixture
-def load_test_images():
-    """Load multiple test images into memory"""
+def link_or_copy():
+    """Return a helper that places a fixture image at a new path without copying where possible"""
+    return _link_or_copy
+
+
+@pytest.fixture(scope="session")
+def load_test_images(test_font):
+    """
+    Load multiple test images into memory once per session
+    
+    The images are shared by every test, so a test that modifies one in place
+    must work on img.copy() instead.
+    """
     # Create test images
     images = {}
     
     # Standard test image
     img = Image.new('RGB', (300, 200), color=(240, 240, 240))
     draw = ImageDraw.Draw(img)
-    try:
-        font = ImageFont.truetype("Arial", 20)
-    except IOError:
-        font = ImageFont.load_default()
-    draw.text((50, 50), "Standard Test", fill=(0, 0, 0), font=font)
+    draw.text((50, 50), "Standard Test", fill=(0, 0, 0), font=test_font)
     images['standard'] = img.copy()
     
     # Blurry image
@@ -130,13 +145,13 @@ def load_test_images():
     # Dark image
     dark = Image.new('RGB', (300, 200), color=(50, 50, 50))
     draw = ImageDraw.Draw(dark)
-    draw.text((50, 50), "Dark Test", fill=(150, 150, 150), font=font)
+    draw.text((50, 50), "Dark Test", fill=(150, 150, 150), font=test_font)
     images['dark'] = dark
     
     # High contrast image
     contrast = Image.new('RGB', (300, 200), color=(255, 255, 255))
     draw = ImageDraw.Draw(contrast)
-    draw.text((50, 50), "High Contrast", fill=(0, 0, 0), font=font)
+    draw.text((50, 50), "High Contrast", fill=(0, 0, 0), font=test_font)
     images['contrast'] = contrast
     
     return images 
\ No newline at end of file
@@ -1,7 +1,6 @@
 import pytest
 import os
-from PIL import Image
-import numpy as np
+from PIL import Image, ImageStat
 
 from src.img_enhance.auto_enhance import (
     analyze_image,
@@ -11,7 +10,6 @@ from src.img_enhance.auto_enhance import (
     batch_auto_enhance,
     get_enhancement_preview_grid
 )
-from src.img_enhance.enhancer import EnhancementParams
 
 class TestAnalyzeImage:
     """Tests for image analysis functions"""
@@ -66,14 +64,14 @@ class TestAnalyzeImage:
         assert dark_metrics['brightness'] < standard_metrics['brightness']
         assert contrast_metrics['contrast'] > standard_metrics['contrast']
     
-    def test_estimate_noise(self, load_test_images, noisy_image_path):
+    def test_estimate_noise(self, load_test_images, noisy_image):
         """Test noise estimation"""
         # Standard image should have low noise
         standard_img = load_test_images['standard'].convert('L')
         standard_noise = estimate_noise(standard_img)
         
         # Noisy image should have higher noise
-        noisy_img = Image.open(noisy_image_path).convert('L')
+        noisy_img = noisy_image.convert('L')
         noisy_noise = estimate_noise(noisy_img)
         
         # This isn't a perfect test since the noisy image is synthetic
@@ -85,95 +83,81 @@ class TestAnalyzeImage:
 class TestDetermineOptimalParams:
     """Tests for parameter determination"""
     
-    def test_determine_optimal_params_standard(self):
-        """Test parameter determination for a standard image"""
-        # Create mock metrics for a standard image
-        metrics = {
-            'brightness': 0.5,       # Medium brightness
-            'contrast': 0.2,         # Medium contrast
-            'sharpness': 0.15,       # Somewhat blurry
-            'color_saturation': 0.2, # Decent color
-            'noise_level': 0.1,      # Low noise
-            'might_be_skewed': False,
-            'r_avg': 0.5,
-            'g_avg': 0.5,
-            'b_avg': 0.5
-        }
-        
-        params = determine_optimal_params(metrics)
-        
-        # Check that parameters were adjusted appropriately
-        assert params.sharpness > 1.0  # Should increase sharpness
-        assert params.contrast > 1.0   # Should increase contrast
-        assert params.brightness == 1.0  # Should leave brightness alone
-        assert params.denoise is False  # Should not denoise
-    
-    def test_determine_optimal_params_dark(self):
-        """Test parameter determination for a dark image"""
-        # Create mock metrics for a dark image
-        metrics = {
-            'brightness': 0.2,       # Very dark
-            'contrast': 0.1,         # Low contrast
-            'sharpness': 0.1,        # Blurry
-            'color_saturation': 0.1, # Low color
-            'noise_level': 0.2,      # Some noise
-            'might_be_skewed': False,
-            'r_avg': 0.2,
-            'g_avg': 0.2,
-            'b_avg': 0.2
-        }
-        
-        params = determine_optimal_params(metrics)
-        
-        # Dark images should get brightness and contrast boost
-        assert params.brightness > 1.0
-        assert params.contrast > 1.0
-    
-    def test_determine_optimal_params_bright(self):
-        """Test parameter determination for a bright, over-exposed image"""
-        # Create mock metrics for an over-exposed image
-        metrics = {
-            'brightness': 0.8,       # Very bright
-            'contrast': 0.05,        # Low contrast (washed out)
-            'sharpness': 0.1,        # Blurry
-            'color_saturation': 0.05, # Low color (washed out)
-            'noise_level': 0.1,      # Low noise
-            'might_be_skewed': False,
-            'r_avg': 0.8,
-            'g_avg': 0.8,
-            'b_avg': 0.8
-        }
-        
+    @pytest.mark.parametrize("metrics,check", [
+        # Standard image: medium brightness/contrast, somewhat blurry, low noise.
+        # Should sharpen and add contrast, but leave brightness and noise alone.
+        (
+            {
+                'brightness': 0.5,
+                'contrast': 0.2,
+                'sharpness': 0.15,
+                'color_saturation': 0.2,
+                'noise_level': 0.1,
+                'might_be_skewed': False,
+                'r_avg': 0.5,
+                'g_avg': 0.5,
+                'b_avg': 0.5
+            },
+            lambda p: (p.sharpness > 1.0 and p.contrast > 1.0
+                       and p.brightness == 1.0 and p.denoise is False)
+        ),
+        # Dark image: should get brightness and contrast boost
+        (
+            {
+                'brightness': 0.2,
+                'contrast': 0.1,
+                'sharpness': 0.1,
+                'color_saturation': 0.1,
+                'noise_level': 0.2,
+                'might_be_skewed': False,
+                'r_avg': 0.2,
+                'g_avg': 0.2,
+                'b_avg': 0.2
+            },
+            lambda p: p.brightness > 1.0 and p.contrast > 1.0
+        ),
+        # Bright, washed-out image: should get reduced brightness, increased contrast
+        (
+            {
+                'brightness': 0.8,
+                'contrast': 0.05,
+                'sharpness': 0.1,
+                'color_saturation': 0.05,
+                'noise_level': 0.1,
+                'might_be_skewed': False,
+                'r_avg': 0.8,
+                'g_avg': 0.8,
+                'b_avg': 0.8
+            },
+            lambda p: p.brightness < 1.0 and p.contrast > 1.0
+        ),
+        # Noisy image: should get denoising
+        (
+            {
+                'brightness': 0.5,
+                'contrast': 0.2,
+                'sharpness': 0.15,
+                'color_saturation': 0.2,
+                'noise_level': 0.4,
+                'might_be_skewed': False,
+                'r_avg': 0.5,
+                'g_avg': 0.5,
+                'b_avg': 0.5
+            },
+            lambda p: p.denoise is True
+        ),
+    ], ids=["standard", "dark", "bright", "noisy"])
+    def test_determine_optimal_params(self, metrics, check):
+        """Test parameter determination for different kinds of images"""
         params = determine_optimal_params(metrics)
         
-        # Bright, washed-out images should get reduced brightness, increased contrast
-        assert params.brightness < 1.0
-        assert params.contrast > 1.0
-    
-    def test_determine_optimal_params_noisy(self):
-        """Test parameter determination for a noisy image"""
-        # Create mock metrics for a noisy image
-        metrics = {
-            'brightness': 0.5,       # Medium brightness
-            'contrast': 0.2,         # Medium contrast
-            'sharpness': 0.15,       # Somewhat blurry
-            'color_saturation': 0.2, # Decent color
-            'noise_level': 0.4,      # High noise
-            'might_be_skewed': False,
-            'r_avg': 0.5,
-            'g_avg': 0.5,
-            'b_avg': 0.5
-        }
-        
-        params = determine_optimal_params(metrics)
-        
-        # Noisy images should get denoising
-        assert params.denoise is True
+        assert check(params), params
 
 
 class TestAutoEnhance:
     """Tests for automatic enhancement functions"""
     
+    @pytest.mark.slow
     def test_auto_enhance_image_path(self, test_image_path):
         """Test auto enhancement from file path"""
         enhanced = auto_enhance_image(test_image_path)
@@ -183,8 +167,7 @@ class TestAutoEnhance:
         assert enhanced.mode == 'RGB'
         
         # Original image dimensions should be preserved
-        original = Image.open(test_image_path)
-        assert enhanced.size == original.size
+        assert enhanced.size == test_image_path.size
     
     def test_auto_enhance_pil_image(self, load_test_images):
         """Test auto enhancement of PIL image"""
@@ -201,28 +184,36 @@ class TestAutoEnhance:
         enhanced_dark = auto_enhance_image(dark_img)
         
         # Enhanced image should generally be brighter
-        dark_brightness = np.mean(np.array(dark_img))
-        enhanced_brightness = np.mean(np.array(enhanced_dark))
+        dark_brightness = sum(ImageStat.Stat(dark_img).mean) / 3
+        enhanced_brightness = sum(ImageStat.Stat(enhanced_dark).mean) / 3
         
         assert enhanced_brightness > dark_brightness
     
-    def test_auto_enhance_preview(self, test_image_path):
+    def test_auto_enhance_preview(self, load_test_images):
         """Test preview generation in auto enhance"""
-        preview = auto_enhance_image(test_image_path, preview=True, preview_size=(100, 100))
+        # Only the preview size matters here, so use the in-memory image
+        preview = auto_enhance_image(load_test_images['standard'], preview=True, preview_size=(100, 100))
         
         # Preview should be smaller
         assert preview.width <= 100
         assert preview.height <= 100
     
-    def test_batch_auto_enhance(self, test_image_path, temp_output_dir):
+    @pytest.mark.slow
+    def test_batch_auto_enhance(self, test_image_path, temp_output_dir, link_or_copy):
         """Test batch processing"""
-        # For simplicity, we'll use the same test image multiple times
-        image_paths = [test_image_path] * 3
+        # Hardlink the test image under distinct names so each input is a
+        # separate file, copying only where links aren't supported
+        image_paths = []
+        for i in range(3):
+            path = os.path.join(temp_output_dir, f"in_{i}.png")
+            link_or_copy(test_image_path, path)
+            image_paths.append(path)
         
         output_paths = batch_auto_enhance(image_paths, temp_output_dir)
         
-        # Should return one output path per input
+        # Should return one distinct output path per input
         assert len(output_paths) == len(image_paths)
+        assert len(set(output_paths)) == len(image_paths)
         
         # All output files should exist
         for path in output_paths:
@@ -232,7 +223,8 @@ class TestAutoEnhance:
             img = Image.open(path)
             assert isinstance(img, Image.Image)
     
-    def test_enhancement_preview_grid(self, test_image_path):
+    @pytest.mark.slow
+    def test_enhancement_preview_grid(self, test_image_path, load_test_images):
         """Test preview grid generation"""
         grid = get_enhancement_preview_grid(test_image_path)
         
@@ -249,5 +241,6 @@ class TestAutoEnhance:
             {"binarize": True}
         ]
         
-        custom_grid = get_enhancement_preview_grid(test_image_path, variations=variations)
+        # The path branch is covered above; reuse the in-memory image here
+        custom_grid = get_enhancement_preview_grid(load_test_images['standard'], variations=variations)
         assert isinstance(custom_grid, Image.Image) 
\ No newline at end of file
@@ -1,7 +1,7 @@
 import pytest
+import argparse
 import os
 import sys
-import shutil
 from unittest.mock import patch
 import tempfile
 import json
@@ -22,33 +22,39 @@ from src.img_enhance.cli import (
 )
 from src.img_enhance.enhancer import EnhancementParams
 
+
+@pytest.fixture
+def set_argv(monkeypatch):
+    """Return a setter that replaces sys.argv for the duration of a test"""
+    def _set(argv):
+        monkeypatch.setattr(sys, "argv", argv)
+    return _set
+
 class TestCommandLineArguments:
     """Tests for command-line argument parsing"""
     
     def test_parse_args_auto_mode(self):
         """Test parsing auto mode arguments"""
-        with patch('sys.argv', ['cli.py', 'auto', 'input.jpg', '-o', 'output.jpg']):
-            args = parse_args()
-            assert args.mode == 'auto'
-            assert args.input_path == 'input.jpg'
-            assert args.output_path == 'output.jpg'
+        args = parse_args(['auto', 'input.jpg', '-o', 'output.jpg'])
+        assert args.mode == 'auto'
+        assert args.input_path == 'input.jpg'
+        assert args.output_path == 'output.jpg'
     
     def test_parse_args_manual_mode(self):
         """Test parsing manual mode arguments"""
-        with patch('sys.argv', [
-            'cli.py', 'manual', 'input.jpg', 
+        args = parse_args([
+            'manual', 'input.jpg', 
             '-o', 'output.jpg',
             '--brightness', '1.2',
             '--contrast', '1.5',
             '--denoise'
-        ]):
-            args = parse_args()
-            assert args.mode == 'manual'
-            assert args.input_path == 'input.jpg'
-            assert args.output_path == 'output.jpg'
-            assert args.brightness == 1.2
-            assert args.contrast == 1.5
-            assert args.denoise is True
+        ])
+        assert args.mode == 'manual'
+        assert args.input_path == 'input.jpg'
+        assert args.output_path == 'output.jpg'
+        assert args.brightness == 1.2
+        assert args.contrast == 1.5
+        assert args.denoise is True
     
     def test_parse_args_batch_mode(self):
         """Test parsing batch mode arguments"""
@@ -70,14 +76,13 @@ class TestCommandLineArguments:
     
     def test_parse_args_preview_mode(self):
         """Test parsing preview mode arguments"""
-        with patch('sys.argv', [
-            'cli.py', 'preview', 'input.jpg',
+        args = parse_args([
+            'preview', 'input.jpg',
             '-o', 'preview.jpg'
-        ]):
-            args = parse_args()
-            assert args.mode == 'preview'
-            assert args.input_path == 'input.jpg'
-            assert args.output_path == 'preview.jpg'
+        ])
+        assert args.mode == 'preview'
+        assert args.input_path == 'input.jpg'
+        assert args.output_path == 'preview.jpg'
 
 
 class TestImagePathFunctions:
@@ -89,16 +94,16 @@ class TestImagePathFunctions:
         assert len(paths) == 1
         assert paths[0] == test_image_path
     
-    def test_get_image_paths_directory(self, temp_output_dir, test_image_path):
+    def test_get_image_paths_directory(self, temp_output_dir, test_image_path, link_or_copy):
         """Test getting paths for a directory"""
         # Create test directory with some image files
         test_dir = os.path.join(temp_output_dir, "test_dir")
         os.makedirs(test_dir, exist_ok=True)
         
-        # Copy the test image to the directory with different names
+        # Link the test image into the directory with different names
         for i in range(3):
             dest_path = os.path.join(test_dir, f"image_{i}.png")
-            shutil.copy(test_image_path, dest_path)
+            link_or_copy(test_image_path, dest_path)
         
         # Also add a non-image file
         with open(os.path.join(test_dir, "text.txt"), 'w') as f:
@@ -114,7 +119,7 @@ class TestImagePathFunctions:
         os.makedirs(sub_dir, exist_ok=True)
         for i in range(2):
             dest_path = os.path.join(sub_dir, f"subimage_{i}.png")
-            shutil.copy(test_image_path, dest_path)
+            link_or_copy(test_image_path, dest_path)
         
         # Test with recursion
         paths_recursive = get_image_paths(test_dir, recursive=True)
@@ -141,90 +146,79 @@ class TestImagePathFunctions:
         assert result == "/path/to/input_custom.jpg"
 
 
-@pytest.mark.parametrize("mode_func, args_dict", [
-    (auto_mode, {"mode": "auto", "input_path": "test.jpg", "output_path": None, "compare": False, "plot": False, "recursive": False}),
-    (manual_mode, {"mode": "manual", "input_path": "test.jpg", "output_path": None, "compare": False, "plot": False, 
-                   "recursive": False, "brightness": 1.0, "contrast": 1.0, "sharpness": 1.0, "color": 1.0,
-                   "denoise": False, "binarize": False, "binarize_threshold": 128, "deskew": False,
-                   "resize_factor": None, "params_file": None, "save_params": None}),
-    (batch_mode, {"mode": "batch", "input_dir": "input/", "output_dir": "output/", "recursive": False, 
-                  "mode": "auto", "params_file": None, "compare": False}),
-    (preview_mode, {"mode": "preview", "input_path": "test.jpg", "output_path": "preview.jpg"})
-])
 class TestModeFunctions:
     """Tests for mode functions"""
     
-    @pytest.fixture
-    def args(self, request, mode_func, args_dict, test_image_path, temp_output_dir):
-        """Create args object with appropriate attributes"""
-        # Replace placeholders with actual paths
-        if "input_path" in args_dict:
-            args_dict["input_path"] = test_image_path
-        if "output_path" in args_dict and args_dict["output_path"] is None:
-            args_dict["output_path"] = os.path.join(temp_output_dir, "output.jpg")
-        if "input_dir" in args_dict:
-            args_dict["input_dir"] = os.path.dirname(test_image_path)
-        if "output_dir" in args_dict:
-            args_dict["output_dir"] = temp_output_dir
-            
-        # Create args object
-        class Args:
-            pass
+    @pytest.fixture(params=["auto", "manual", "batch", "preview"])
+    def mode_setup(self, request, test_image_path, temp_output_dir):
+        """Return (mode_func, args) for each mode, with paths pointing at test files"""
+        output_path = os.path.join(temp_output_dir, "output.jpg")
         
-        args = Args()
-        for key, value in args_dict.items():
-            setattr(args, key, value)
-            
-        return args
+        if request.param == "auto":
+            mode_func = auto_mode
+            args_dict = {"mode": "auto", "input_path": test_image_path, "output_path": output_path,
+                         "compare": False, "plot": False, "recursive": False}
+        elif request.param == "manual":
+            mode_func = manual_mode
+            args_dict = {"mode": "manual", "input_path": test_image_path, "output_path": output_path,
+                         "compare": False, "plot": False, "recursive": False,
+                         "brightness": 1.0, "contrast": 1.0, "sharpness": 1.0, "color": 1.0,
+                         "denoise": False, "binarize": False, "binarize_threshold": 128, "deskew": False,
+                         "resize_factor": None, "params_file": None, "save_params": None}
+        elif request.param == "batch":
+            # 'mode' doubles as the batch enhancement mode, as in the batch subparser
+            mode_func = batch_mode
+            args_dict = {"mode": "auto", "input_dir": os.path.dirname(test_image_path),
+                         "output_dir": temp_output_dir, "recursive": False,
+                         "params_file": None, "compare": False}
+        else:
+            mode_func = preview_mode
+            args_dict = {"mode": "preview", "input_path": test_image_path,
+                         "output_path": os.path.join(temp_output_dir, "preview.jpg")}
+        
+        return mode_func, argparse.Namespace(**args_dict)
     
-    def test_mode_runs_without_error(self, mode_func, args, capsys):
+    def test_mode_runs_without_error(self, mode_setup, mocker, capsys):
         """Test that mode function runs without error"""
+        mode_func, args = mode_setup
+        
+        # Patch the enhancement functions with a dummy PIL image / output list
+        dummy_img = Image.new('RGB', (100, 100))
+        mocker.patch('src.img_enhance.cli.auto_enhance_image', return_value=dummy_img)
+        mocker.patch('src.img_enhance.cli.batch_auto_enhance',
+                     return_value=["/path/to/output1.jpg", "/path/to/output2.jpg"])
+        mocker.patch('src.img_enhance.auto_enhance.get_enhancement_preview_grid', return_value=dummy_img)
+        
         try:
-            # Patch any file system operations that might be performed
-            with patch('src.img_enhance.cli.auto_enhance_image') as mock_auto_enhance, \
-                 patch('src.img_enhance.cli.batch_auto_enhance') as mock_batch:
-                
-                # Return a dummy PIL image from mock functions
-                dummy_img = Image.new('RGB', (100, 100))
-                mock_auto_enhance.return_value = dummy_img
-                mock_batch.return_value = ["/path/to/output1.jpg", "/path/to/output2.jpg"]
-                
-                # Conditionally patch for preview mode
-                if mode_func.__name__ == 'preview_mode':
-                    with patch('src.img_enhance.auto_enhance.get_enhancement_preview_grid', return_value=dummy_img):
-                        # Run the mode function 
-                        mode_func(args)
-                else:
-                    # Run the mode function for other modes
-                    mode_func(args)
-                
-                # If we get here without error, the test passes
-                captured = capsys.readouterr()
-                assert "No supported image files found" not in captured.out
-                
+            mode_func(args)
         except Exception as e:
             pytest.fail(f"Mode function raised exception: {e}")
+        
+        captured = capsys.readouterr()
+        assert "No supported image files found" not in captured.out
 
 
 class TestMainFunction:
     """Tests for main function"""
     
-    def test_main_with_auto_mode(self, test_image_path, temp_output_dir):
+    def test_main_with_auto_mode(self, set_argv, test_image_path, temp_output_dir):
         """Test main function with auto mode"""
-        with patch('sys.argv', [
+        set_argv([
             'cli.py', 'auto', test_image_path,
             '-o', os.path.join(temp_output_dir, "auto_output.jpg")
-        ]), patch('src.img_enhance.cli.auto_mode') as mock_auto_mode:
+        ])
+        with patch('src.img_enhance.cli.auto_mode') as mock_auto_mode:
             main()
             mock_auto_mode.assert_called_once()
     
-    def test_main_with_manual_mode(self, test_image_path, temp_output_dir):
+    def test_main_with_manual_mode(self, set_argv, test_image_path, temp_output_dir):
         """Test main function with manual mode"""
-        with patch('sys.argv', [
+        set_argv([
             'cli.py', 'manual', test_image_path,
             '-o', os.path.join(temp_output_dir, "manual_output.jpg"),
             '--brightness', '1.2'
-        ]), patch('src.img_enhance.cli.manual_mode') as mock_manual_mode:
+        ])
+        with patch('src.img_enhance.cli.manual_mode') as mock_manual_mode:
             main()
             mock_manual_mode.assert_called_once()
     
@@ -244,11 +238,12 @@ class TestMainFunction:
             # Verify batch_mode was called
             mock_batch_mode.assert_called_once()
     
-    def test_main_with_preview_mode(self, test_image_path, temp_output_dir):
+    def test_main_with_preview_mode(self, set_argv, test_image_path, temp_output_dir):
         """Test main function with preview mode"""
-        with patch('sys.argv', [
+        set_argv([
             'cli.py', 'preview', test_image_path,
             '-o', os.path.join(temp_output_dir, "preview.jpg")
-        ]), patch('src.img_enhance.cli.preview_mode') as mock_preview_mode:
+        ])
+        with patch('src.img_enhance.cli.preview_mode') as mock_preview_mode:
             main()
             mock_preview_mode.assert_called_once() 
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pytest
 import os
-from PIL import Image
+from PIL import Image, ImageStat
 import numpy as np
 
 from src.img_enhance.enhancer import ImageEnhancer, EnhancementParams
@@ -10,16 +10,18 @@ class TestEnhancementParams:
     
     def test_default_params(self):
         """Test default parameter values"""
-        params = EnhancementParams()
-        assert params.brightness == 1.0
-        assert params.contrast == 1.0
-        assert params.sharpness == 1.0
-        assert params.color == 1.0
-        assert params.denoise is False
-        assert params.binarize is False
-        assert params.binarize_threshold == 128
-        assert params.deskew is False
-        assert params.resize_factor is None
+        # Dataclass equality compares all fields in one check
+        assert EnhancementParams() == EnhancementParams(
+            brightness=1.0,
+            contrast=1.0,
+            sharpness=1.0,
+            color=1.0,
+            denoise=False,
+            binarize=False,
+            binarize_threshold=128,
+            deskew=False,
+            resize_factor=None
+        )
     
     def test_custom_params(self):
         """Test custom parameter values"""
@@ -65,10 +67,8 @@ class TestEnhancementParams:
         
         params = EnhancementParams.from_dict(params_dict)
         
-        assert params.brightness == 1.2
-        assert params.contrast == 1.5
-        assert params.denoise is True
-        assert params.sharpness == 1.0  # Default value
+        # Unspecified fields keep their defaults
+        assert params == EnhancementParams(brightness=1.2, contrast=1.5, denoise=True)
 
 
 class TestImageEnhancer:
@@ -139,9 +139,9 @@ class TestImageEnhancer:
         darkened = enhancer_dark.enhance(img)
         
         # Compare average pixel values
-        original_brightness = np.mean(np.array(img))
-        bright_brightness = np.mean(np.array(brightened))
-        dark_brightness = np.mean(np.array(darkened))
+        original_brightness = sum(ImageStat.Stat(img).mean) / 3
+        bright_brightness = sum(ImageStat.Stat(brightened).mean) / 3
+        dark_brightness = sum(ImageStat.Stat(darkened).mean) / 3
         
         assert bright_brightness > original_brightness
         assert dark_brightness < original_brightness
@@ -156,8 +156,8 @@ class TestImageEnhancer:
         enhanced = enhancer.enhance(img)
         
         # Compare standard deviation of pixel values (higher std = higher contrast)
-        original_std = np.std(np.array(img))
-        enhanced_std = np.std(np.array(enhanced))
+        original_std = sum(ImageStat.Stat(img).stddev) / 3
+        enhanced_std = sum(ImageStat.Stat(enhanced).stddev) / 3
         
         assert enhanced_std > original_std
     
@@ -173,20 +173,19 @@ class TestImageEnhancer:
         # Just make sure it runs without errors
         assert isinstance(sharpened, Image.Image)
     
-    def test_denoise(self, noisy_image_path):
+    def test_denoise(self, noisy_image):
         """Test denoising"""
         # Create enhancer with denoising
         params = EnhancementParams(denoise=True)
         enhancer = ImageEnhancer(params)
         
-        # Load noisy image
-        noisy_img = Image.open(noisy_image_path)
+        noisy_img = noisy_image
         denoised = enhancer.enhance(noisy_img)
         
         # Denoised image should have lower standard deviation in some regions
         # (This is a simple heuristic, not perfect)
-        noisy_array = np.array(noisy_img)
-        denoised_array = np.array(denoised)
+        noisy_array = np.asarray(noisy_img)
+        denoised_array = np.asarray(denoised)
         
         # Check a small region
         region_noisy = noisy_array[50:100, 50:100]
@@ -211,9 +210,8 @@ class TestImageEnhancer:
         assert binarized.mode == '1'
         
         # Check that only black and white pixels exist
-        binary_array = np.array(binarized)
-        unique_values = np.unique(binary_array)
-        assert len(unique_values) <= 2
+        lo, hi = binarized.getextrema()
+        assert lo in (0, 255) and hi in (0, 255)
     
     def test_resize(self, load_test_images):
         """Test resize functionality"""
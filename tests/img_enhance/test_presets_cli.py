@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import unittest
+import pytest
 from unittest.mock import patch, MagicMock, call
 import os
 import sys
@@ -22,23 +23,36 @@ from src.img_enhance.text_presets import (
 )
 from src.img_enhance.utils import create_comparison_image
 
+
+def _encode_white_image(fmt):
+    """Encode a plain white 100x100 image in the given format"""
+    buf = io.BytesIO()
+    Image.new('RGB', (100, 100), color='white').save(buf, format=fmt)
+    return buf.getvalue()
+
+
+# Encoded once at import and written out as the dummy CLI input file
+_WHITE_100_JPEG = _encode_white_image('JPEG')
+
 class TestPresetsCLI(unittest.TestCase):
     """Test cases for presets_cli.py module"""
     
-    def setUp(self):
-        """Set up test fixtures"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures once for all tests in the class"""
         # Create a temporary directory for test files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.input_file = os.path.join(self.temp_dir.name, "input.jpg")
-        self.output_file = os.path.join(self.temp_dir.name, "output.jpg")
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.input_file = os.path.join(cls.temp_dir.name, "input.jpg")
+        cls.output_file = os.path.join(cls.temp_dir.name, "output.jpg")
         
         # Create a dummy input file
-        img = Image.new('RGB', (100, 100), color='white')
-        img.save(self.input_file)
+        with open(cls.input_file, 'wb') as f:
+            f.write(_WHITE_100_JPEG)
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Tear down test fixtures"""
-        self.temp_dir.cleanup()
+        cls.temp_dir.cleanup()
     
     def test_parse_args(self):
         """Test argument parsing"""
@@ -120,37 +134,42 @@ class TestPresetsCLI(unittest.TestCase):
         # Test with exist_ok behavior
         # Should not raise an exception when called again
         os.makedirs(nested_dir, exist_ok=True)
+
+
+class TestPresetsWithRealImage:
+    """Integration tests running the presets on a real image"""
+    
+    @pytest.fixture
+    def img(self):
+        """Create a plain white test image"""
+        return Image.new('RGB', (100, 100), color='white')
     
-    def test_presets_with_real_image(self):
-        """Test presets with a real image (integration test)"""
-        # Create a test image
-        img = Image.new('RGB', (100, 100), color='white')
-        img_path = os.path.join(self.temp_dir.name, "test_image.png")
-        img.save(img_path)
+    @pytest.mark.parametrize("preset_id", range(4))
+    def test_presets_with_real_image(self, img, preset_id):
+        """Test each preset with a real image (integration test)"""
+        # Apply the preset
+        enhanced = enhance_with_preset(img, preset_id)
         
-        # Test each preset with the image
-        for preset_id in range(4):
-            # Apply the preset
-            enhanced = enhance_with_preset(img, preset_id)
-            
-            # Verify enhanced image is still an image
-            self.assertIsInstance(enhanced, Image.Image)
-            self.assertEqual(enhanced.mode, 'RGB')
-            self.assertEqual(enhanced.size, (100, 100))
-            
-            # Save the enhanced image
-            output_path = os.path.join(self.temp_dir.name, f"enhanced_{preset_id}.png")
-            enhanced.save(output_path)
-            
-            # Verify the file was created
-            self.assertTrue(os.path.exists(output_path))
-            
-            # Create a comparison image
-            if preset_id == 0:  # Only do this once to save time
-                comparison = create_comparison_image(img, enhanced, None, f"Preset {preset_id}")
-                comparison_path = os.path.join(self.temp_dir.name, "comparison.png")
-                comparison.save(comparison_path)
-                self.assertTrue(os.path.exists(comparison_path))
+        # Verify enhanced image is still an image
+        assert isinstance(enhanced, Image.Image)
+        assert enhanced.mode == 'RGB'
+        assert enhanced.size == (100, 100)
+        
+        # Verify the enhanced image encodes to a valid PNG
+        buf = io.BytesIO()
+        enhanced.save(buf, format='PNG')
+        buf.seek(0)
+        Image.open(buf).verify()
+    
+    def test_comparison_image(self, img):
+        """Test creating a comparison image for a preset result"""
+        enhanced = enhance_with_preset(img, 0)
+        
+        comparison = create_comparison_image(img, enhanced, None, "Preset 0")
+        buf = io.BytesIO()
+        comparison.save(buf, format='PNG')
+        buf.seek(0)
+        Image.open(buf).verify()
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import unittest
+import pytest
 from unittest.mock import patch, MagicMock
 import os
 import sys
@@ -20,6 +21,56 @@ from src.img_enhance.text_presets import (
 )
 from src.img_enhance.enhancer import EnhancementParams
 
+def _make_test_img():
+    """Create a simple 100x100 white test image with some text-like features"""
+    # Add some "text-like" black pixels in a diagonal pattern
+    # for 30 <= x < 70 and 40 <= y < 60
+    y, x = np.ogrid[:100, :100]
+    mask = ((x + y) % 3 == 0) & (x >= 30) & (x < 70) & (y >= 40) & (y < 60)
+    arr = np.full((100, 100, 3), 255, np.uint8)
+    arr[mask] = 0
+    return Image.fromarray(arr)
+
+
+@pytest.fixture(scope="module")
+def test_img():
+    """Create the test image once for all preset checks"""
+    return _make_test_img()
+
+
+class TestPresetFunctions:
+    """Shared checks for each text preset function"""
+    
+    @pytest.mark.parametrize("fn", [
+        mixed_content_text_enhance,
+        text_document_enhance,
+        text_only_enhance,
+        receipt_enhance
+    ], ids=lambda fn: fn.__name__)
+    def test_preset_enhance(self, fn, test_img):
+        """Test that a preset returns a processed image of the same size"""
+        enhanced = fn(test_img)
+        
+        # Check that output is an image
+        assert isinstance(enhanced, Image.Image)
+        # Check that size is unchanged
+        assert enhanced.size == test_img.size
+        # Check that some processing has occurred (image should not be identical)
+        assert enhanced.tobytes() != test_img.tobytes()
+    
+    def test_receipt_enhance_grayscale(self, test_img):
+        """Test that receipt_enhance converts to grayscale (color=0.0)"""
+        enhanced = receipt_enhance(test_img)
+        
+        # Check if R, G, B values are equal for a sample of pixels
+        enhanced_array = np.asarray(enhanced)
+        sample_pixels = enhanced_array[40:50, 40:50]
+        # In grayscale images, R=G=B for each pixel
+        r_equals_g = np.all(sample_pixels[:,:,0] == sample_pixels[:,:,1])
+        g_equals_b = np.all(sample_pixels[:,:,1] == sample_pixels[:,:,2])
+        assert r_equals_g and g_equals_b, "Receipt enhance should convert to grayscale"
+
+
 class TestTextPresets(unittest.TestCase):
     """Test cases for text_presets.py module"""
     
@@ -27,13 +78,7 @@ class TestTextPresets(unittest.TestCase):
         """Set up test fixtures"""
         # Create a simple test image (100x100 with some text-like features)
         self.test_img_size = (100, 100)
-        self.test_img = Image.new('RGB', self.test_img_size, color='white')
-        # Add some "text-like" black pixels
-        pixels = self.test_img.load()
-        for i in range(30, 70):
-            for j in range(40, 60):
-                if (i + j) % 3 == 0:  # Create a pattern
-                    pixels[i, j] = (0, 0, 0)
+        self.test_img = _make_test_img()
         
         # Create a temporary file for saving tests
         self.temp_dir = tempfile.TemporaryDirectory()
@@ -44,59 +89,6 @@ class TestTextPresets(unittest.TestCase):
         """Tear down test fixtures"""
         self.temp_dir.cleanup()
     
-    def test_mixed_content_text_enhance(self):
-        """Test mixed_content_text_enhance function"""
-        enhanced = mixed_content_text_enhance(self.test_img)
-        
-        # Check that output is an image
-        self.assertIsInstance(enhanced, Image.Image)
-        # Check that size is unchanged
-        self.assertEqual(enhanced.size, self.test_img_size)
-        # Check that some processing has occurred (image should not be identical)
-        self.assertFalse(np.array_equal(np.array(enhanced), np.array(self.test_img)))
-    
-    def test_text_document_enhance(self):
-        """Test text_document_enhance function"""
-        enhanced = text_document_enhance(self.test_img)
-        
-        # Check that output is an image
-        self.assertIsInstance(enhanced, Image.Image)
-        # Check that size is unchanged
-        self.assertEqual(enhanced.size, self.test_img_size)
-        # Check that some processing has occurred
-        self.assertFalse(np.array_equal(np.array(enhanced), np.array(self.test_img)))
-    
-    def test_text_only_enhance(self):
-        """Test text_only_enhance function"""
-        enhanced = text_only_enhance(self.test_img)
-        
-        # Check that output is an image
-        self.assertIsInstance(enhanced, Image.Image)
-        # Check that size is unchanged
-        self.assertEqual(enhanced.size, self.test_img_size)
-        # Check that some processing has occurred
-        self.assertFalse(np.array_equal(np.array(enhanced), np.array(self.test_img)))
-    
-    def test_receipt_enhance(self):
-        """Test receipt_enhance function"""
-        enhanced = receipt_enhance(self.test_img)
-        
-        # Check that output is an image
-        self.assertIsInstance(enhanced, Image.Image)
-        # Check that size is unchanged
-        self.assertEqual(enhanced.size, self.test_img_size)
-        # Check that some processing has occurred
-        self.assertFalse(np.array_equal(np.array(enhanced), np.array(self.test_img)))
-        
-        # Receipt should convert to grayscale (color=0.0)
-        # Check if R, G, B values are equal for a sample of pixels
-        enhanced_array = np.array(enhanced)
-        sample_pixels = enhanced_array[40:50, 40:50]
-        # In grayscale images, R=G=B for each pixel
-        r_equals_g = np.all(sample_pixels[:,:,0] == sample_pixels[:,:,1])
-        g_equals_b = np.all(sample_pixels[:,:,1] == sample_pixels[:,:,2])
-        self.assertTrue(r_equals_g and g_equals_b, "Receipt enhance should convert to grayscale")
-    
     def test_get_preset_name(self):
         """Test get_preset_name function"""
         self.assertEqual(get_preset_name(0), "Mixed Content with Text Enhancement")
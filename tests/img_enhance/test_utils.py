@@ -1,10 +1,7 @@
 import pytest
 import os
 import json
-import tempfile
 from PIL import Image
-import matplotlib.pyplot as plt
-import numpy as np
 
 from src.img_enhance.utils import (
     save_params_to_json,
@@ -153,11 +150,8 @@ class TestComparisonImage:
 class TestMetricsPlotting:
     """Tests for metrics plotting function"""
     
-    def test_plot_enhancement_metrics(self, load_test_images, temp_output_dir, monkeypatch):
+    def test_plot_enhancement_metrics(self, load_test_images, temp_output_dir):
         """Test metrics plotting"""
-        # Mock plt.show to avoid opening windows during tests
-        monkeypatch.setattr(plt, 'show', lambda: None)
-        
         original = load_test_images['standard']
         enhanced = load_test_images['contrast']
         params = EnhancementParams(brightness=1.2, contrast=1.5)
@@ -2,141 +2,538 @@
 Tests for the OCR Engine module
 """
 
+import asyncio
 import os
-import unittest
-from unittest.mock import patch, MagicMock
-from PIL import Image
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock, create_autospec
+import PIL.Image
+import pytest
+import pytesseract
 
 # Import the OCREngine class
-from src.ocrMod.ocr_engine import OCREngine
+from src.ocrMod import ocr_engine as ocr_engine_module
+from src.ocrMod.ocr_engine import OCREngine, _FORMAT_HANDLERS
 
 
-class TestOCREngine(unittest.TestCase):
-    """Test cases for OCREngine class"""
+def _mock_pil_image():
+    """Create a mock PIL Image; spec_set also rejects setting attributes the real class lacks"""
+    return MagicMock(spec_set=PIL.Image.Image)
+
+
+def _autospec_calls(module, names):
+    """
+    Build a stand-in for a module exposing autospecced versions of only the named functions.
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.ocr_engine = OCREngine()
-        
-        # Create a test directory path
-        self.test_dir = os.path.dirname(os.path.abspath(__file__))
-        self.test_resources_dir = os.path.join(self.test_dir, 'resources')
-        
-        # Ensure test resources directory exists
-        os.makedirs(self.test_resources_dir, exist_ok=True)
+    Speccing single functions rather than whole modules keeps fixture setup
+    cheap, and calls that drift from the real signatures still fail.
+    """
+    mock = MagicMock(spec_set=list(names))
+    for name in names:
+        setattr(mock, name, create_autospec(getattr(module, name)))
+    return mock
+
+
+@pytest.fixture
+def mock_pytesseract(monkeypatch):
+    """Replace pytesseract in the engine module with mocks of the calls it makes."""
+    mock = _autospec_calls(pytesseract, ['image_to_string', 'image_to_pdf_or_hocr',
+                                         'image_to_data', 'image_to_alto_xml'])
+    monkeypatch.setattr(ocr_engine_module, 'pytesseract', mock)
+    return mock
+
+
+@pytest.fixture
+def mock_image(monkeypatch):
+    """Replace PIL.Image in the engine module with mocks of open and fromarray."""
+    mock = _autospec_calls(PIL.Image, ['open', 'fromarray'])
+    monkeypatch.setattr(ocr_engine_module, 'Image', mock)
+    return mock
+
+
+@pytest.fixture
+def mock_os(monkeypatch):
+    """Mock os.stat for the engine, so made-up image paths pass the existence check."""
+    # Everything else (cpu_count, fspath) passes through to the real os module
+    mock = MagicMock(wraps=os)
+    mock.stat = create_autospec(os.stat)
+    monkeypatch.setattr(ocr_engine_module, 'os', mock)
+    return mock
+
+
+@pytest.fixture
+def mock_api_cls(monkeypatch):
+    """Replace the tesserocr PyTessBaseAPI class."""
+    mock = MagicMock()
+    monkeypatch.setattr(ocr_engine_module, 'PyTessBaseAPI', mock)
+    return mock
+
+
+@pytest.fixture(scope="module")
+def ocr_engine():
+    """Default engine shared by the tests that do not configure their own."""
+    return OCREngine()
+
+
+def test_import_is_lazy():
+    """Test that importing the engine module does not import pytesseract, PIL, tesserocr or asyncio"""
+    # A fresh interpreter, since this one has already imported them
+    code = (
+        "import sys, src.ocrMod.ocr_engine; "
+        "assert 'pytesseract' not in sys.modules; "
+        "assert 'PIL.Image' not in sys.modules; "
+        "assert 'tesserocr' not in sys.modules; "
+        "assert 'asyncio' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   cwd=Path(__file__).parent.parent.parent)
+
+
+class TestOCREngine:
+    """Test cases for OCREngine class"""
     
-    @patch('src.ocrMod.ocr_engine.pytesseract')
-    @patch('src.ocrMod.ocr_engine.Image.open')
-    @patch('src.ocrMod.ocr_engine.os.path.exists')
-    def test_process_image_text_format(self, mock_exists, mock_image_open, mock_pytesseract):
-        """Test processing an image with text output format"""
-        # Mock file existence
-        mock_exists.return_value = True
-        
-        # Mock image
-        mock_img = MagicMock()
-        mock_image_open.return_value = mock_img
-        
+    @pytest.mark.parametrize("output_format, method, expected, extra_kwargs", [
+        ("text", "image_to_string", "Sample OCR Text", {}),
+        ("hocr", "image_to_pdf_or_hocr", b"<div class='ocr_page'>Sample hOCR</div>", {"extension": "hocr"}),
+    ], ids=["text", "hocr"])
+    def test_process_image_format(self, ocr_engine, mock_pytesseract, mock_image, mock_os,
+                                  output_format, method, expected, extra_kwargs):
+        """Test processing an image file in each path-based output format"""
         # Mock pytesseract response
-        expected_text = "Sample OCR Text"
-        mock_pytesseract.image_to_string.return_value = expected_text
+        getattr(mock_pytesseract, method).return_value = expected
         
         # Test the method
-        result = self.ocr_engine.process_image(
+        result = ocr_engine.process_image(
             image_path="dummy_path.jpg",
             lang="eng",
-            output_format="text"
+            output_format=output_format
         )
         
         # Assertions
-        self.assertEqual(result, expected_text)
+        assert result == expected
+        getattr(mock_pytesseract, method).assert_called_once_with(
+            "dummy_path.jpg", lang="eng", config="--oem 1 --psm 6", **extra_kwargs
+        )
+        mock_image.open.assert_not_called()
+    
+    def test_process_image_accepts_path_object(self, ocr_engine, mock_pytesseract, mock_os):
+        """Test that pathlib paths are passed to Tesseract as str"""
+        ocr_engine.process_image(Path("dummy_path.jpg"))
+        
+        # Assertions
         mock_pytesseract.image_to_string.assert_called_once_with(
-            mock_img, lang="eng", config=""
+            "dummy_path.jpg", lang="eng", config="--oem 1 --psm 6"
         )
     
-    @patch('src.ocrMod.ocr_engine.pytesseract')
-    def test_process_pil_image(self, mock_pytesseract):
+    def test_process_pil_image(self, ocr_engine, mock_pytesseract):
         """Test processing a PIL Image directly"""
         # Create a mock PIL Image
-        mock_img = MagicMock(spec=Image.Image)
+        mock_img = _mock_pil_image()
         
         # Mock pytesseract response
         expected_text = "Direct PIL Image OCR Text"
         mock_pytesseract.image_to_string.return_value = expected_text
         
         # Test the method
-        result = self.ocr_engine.process_pil_image(
+        result = ocr_engine.process_pil_image(
             image=mock_img,
             lang="eng",
             output_format="text"
         )
         
         # Assertions
-        self.assertEqual(result, expected_text)
+        assert result == expected_text
         mock_pytesseract.image_to_string.assert_called_once_with(
-            mock_img, lang="eng", config=""
+            mock_img, lang="eng", config="--oem 1 --psm 6"
         )
     
-    @patch('src.ocrMod.ocr_engine.pytesseract')
-    @patch('src.ocrMod.ocr_engine.Image.open')
-    @patch('src.ocrMod.ocr_engine.os.path.exists')
-    def test_process_image_hocr_format(self, mock_exists, mock_image_open, mock_pytesseract):
-        """Test processing an image with hOCR output format"""
-        # Mock file existence
-        mock_exists.return_value = True
+    @pytest.mark.parametrize("engine_kwargs, call_kwargs, expected_config", [
+        ({"sparse_text": True}, {}, "--oem 1 --psm 11"),
+        ({}, {"config": ""}, ""),
+    ], ids=["sparse_text", "explicit_empty_config"])
+    def test_config_selection(self, mock_pytesseract, engine_kwargs, call_kwargs, expected_config):
+        """Test that sparse_text and explicit configs replace the default config"""
+        mock_img = _mock_pil_image()
         
-        # Mock image
-        mock_img = MagicMock()
-        mock_image_open.return_value = mock_img
+        OCREngine(**engine_kwargs).process_pil_image(mock_img, **call_kwargs)
         
-        # Mock pytesseract response
-        expected_hocr = "<div class='ocr_page'>Sample hOCR</div>"
-        mock_pytesseract.image_to_pdf_or_hocr.return_value = expected_hocr
+        # Assertions
+        mock_pytesseract.image_to_string.assert_called_once_with(
+            mock_img, lang="eng", config=expected_config
+        )
+    
+    def test_sparse_text_conflicts_with_default_config(self):
+        """Test that sparse_text cannot silently override an explicit default_config"""
+        with pytest.raises(ValueError):
+            OCREngine(sparse_text=True, default_config="--psm 4")
+    
+    def test_process_image_decodes_unsupported_format(self, ocr_engine, mock_pytesseract, mock_image, mock_os):
+        """Test that formats Tesseract cannot read are decoded with Pillow"""
+        ocr_engine.process_image(image_path="dummy_path.webp")
         
-        # Test the method
-        result = self.ocr_engine.process_image(
-            image_path="dummy_path.jpg",
-            lang="eng",
-            output_format="hocr"
+        # Assertions
+        mock_image.open.assert_called_once_with("dummy_path.webp")
+        mock_pytesseract.image_to_string.assert_called_once_with(
+            mock_image.open.return_value, lang="eng", config="--oem 1 --psm 6"
         )
+    
+    def test_process_image_preprocess(self, ocr_engine, mock_pytesseract, mock_image, mock_os):
+        """Test that preprocessing runs grayscale, bilateral filter and Otsu threshold in order"""
+        mock_cv2 = MagicMock()
+        mock_cv2.threshold.return_value = (127, MagicMock())
+        
+        with patch.dict(sys.modules, {'cv2': mock_cv2}):
+            ocr_engine.process_image("dummy_path.jpg")
+            assert mock_cv2.mock_calls == []
+            
+            ocr_engine.process_image("dummy_path.jpg", preprocess=True)
         
         # Assertions
-        self.assertEqual(result, expected_hocr)
-        mock_pytesseract.image_to_pdf_or_hocr.assert_called_once_with(
-            mock_img, lang="eng", extension='hocr', config=""
+        # Ignore the flag arithmetic (THRESH_BINARY | THRESH_OTSU) on the mock
+        called = [name for name, args, kwargs in mock_cv2.mock_calls if '.' not in name]
+        assert called == ['imread', 'cvtColor', 'bilateralFilter', 'threshold']
+        mock_image.fromarray.assert_called_once_with(mock_cv2.threshold.return_value[1])
+        mock_pytesseract.image_to_string.assert_called_with(
+            mock_image.fromarray.return_value, lang="eng", config="--oem 1 --psm 6"
         )
     
-    @patch('src.ocrMod.ocr_engine.os.path.exists')
-    def test_process_image_file_not_found(self, mock_exists):
+    def test_process_image_file_not_found(self, ocr_engine, mock_pytesseract, mock_os):
         """Test error handling when file doesn't exist"""
         # Mock file not existing
-        mock_exists.return_value = False
+        mock_os.stat.side_effect = FileNotFoundError
         
         # Test the method raises FileNotFoundError
-        with self.assertRaises(FileNotFoundError):
-            self.ocr_engine.process_image(
+        with pytest.raises(FileNotFoundError):
+            ocr_engine.process_image(
                 image_path="nonexistent_file.jpg"
             )
+        mock_pytesseract.image_to_string.assert_not_called()
     
-    @patch('src.ocrMod.ocr_engine.pytesseract')
-    @patch('src.ocrMod.ocr_engine.Image.open')
-    @patch('src.ocrMod.ocr_engine.os.path.exists')
-    def test_process_image_invalid_format(self, mock_exists, mock_image_open, mock_pytesseract):
-        """Test error handling with invalid output format"""
-        # Mock file existence
-        mock_exists.return_value = True
-        
-        # Mock image
-        mock_img = MagicMock()
-        mock_image_open.return_value = mock_img
+    def test_process_image_file_not_found_when_opened(self, mock_image, mock_os):
+        """Test that opening the file for max_pixels replaces the separate existence check"""
+        mock_image.open.side_effect = FileNotFoundError
         
+        # Test the method raises FileNotFoundError
+        with pytest.raises(FileNotFoundError):
+            OCREngine(max_pixels=1000000).process_image(
+                image_path="nonexistent_file.jpg"
+            )
+        mock_os.stat.assert_not_called()
+    
+    def test_process_image_invalid_format(self, ocr_engine, mock_os):
+        """Test error handling with invalid output format"""
         # Test the method raises ValueError
-        with self.assertRaises(ValueError):
-            self.ocr_engine.process_image(
+        with pytest.raises(ValueError):
+            ocr_engine.process_image(
                 image_path="dummy_path.jpg",
                 output_format="invalid_format"
             )
+    
+    def test_process_image_downsamples_large(self, mock_pytesseract, mock_image):
+        """Test that images over max_pixels are decoded at reduced size"""
+        mock_img = mock_image.open.return_value
+        mock_img.size = (10000, 10000)
+        
+        ocr_engine = OCREngine(max_pixels=1000000)
+        ocr_engine.process_image("huge_scan.jpg")
+        
+        # Assertions
+        mock_img.draft.assert_called_once_with('L', (1000, 1000))
+        mock_img.thumbnail.assert_called_once_with((1000, 1000))
+        mock_pytesseract.image_to_string.assert_called_once_with(
+            mock_img, lang="eng", config="--oem 1 --psm 6"
+        )
+    
+    def test_process_image_rejects_large(self, mock_pytesseract, mock_image):
+        """Test that images over max_pixels raise when downsampling is disabled"""
+        mock_image.open.return_value.size = (10000, 10000)
+        
+        ocr_engine = OCREngine(max_pixels=1000000, allow_downsample=False)
+        
+        # Test the method raises ValueError
+        with pytest.raises(ValueError):
+            ocr_engine.process_image("huge_scan.jpg")
+        mock_pytesseract.image_to_string.assert_not_called()
+    
+    def test_format_dispatch_uses_handler_table(self, ocr_engine, mock_pytesseract):
+        """Test that output formats are dispatched through the handler table"""
+        handler = MagicMock(return_value="custom output")
+        mock_img = _mock_pil_image()
+        
+        with patch.dict(_FORMAT_HANDLERS, {'custom': handler}):
+            result = ocr_engine.process_pil_image(mock_img, output_format="Custom")
+        
+        # Assertions
+        assert result == "custom output"
+        handler.assert_called_once_with(mock_img, "eng", "--oem 1 --psm 6")
+        mock_pytesseract.image_to_string.assert_not_called()
+    
+    def test_use_tesserocr_requires_tesserocr(self, monkeypatch):
+        """Test that use_tesserocr=True raises ImportError when tesserocr is not installed"""
+        # None in sys.modules makes the import fail even where tesserocr is installed
+        monkeypatch.setitem(sys.modules, 'tesserocr', None)
+        monkeypatch.setattr(ocr_engine_module, 'PyTessBaseAPI', None)
+        
+        with pytest.raises(ImportError):
+            OCREngine(use_tesserocr=True)
+    
+    def test_tesserocr_api_reused(self, mock_api_cls):
+        """Test that the tesserocr API is created once and reused across calls"""
+        mock_api = mock_api_cls.return_value
+        mock_api.GetUTF8Text.return_value = "In-process OCR Text"
+        mock_img = _mock_pil_image()
+        
+        ocr_engine = OCREngine(use_tesserocr=True)
+        first = ocr_engine.process_pil_image(mock_img, lang="eng")
+        second = ocr_engine.process_pil_image(mock_img, lang="eng")
+        
+        # Assertions
+        assert first == "In-process OCR Text"
+        assert second == "In-process OCR Text"
+        mock_api_cls.assert_called_once_with(lang="eng", oem=1)
+        assert mock_api.SetImage.call_count == 2
+        mock_api.SetPageSegMode.assert_called_with(6)
+    
+    def test_tesserocr_api_per_language(self, mock_api_cls):
+        """Test that a new tesserocr API is initialized when the language changes"""
+        mock_img = _mock_pil_image()
+        
+        ocr_engine = OCREngine(use_tesserocr=True)
+        ocr_engine.process_pil_image(mock_img, lang="eng")
+        ocr_engine.process_pil_image(mock_img, lang="fra")
+        ocr_engine.process_pil_image(mock_img, lang="eng")
+        
+        # Assertions
+        assert mock_api_cls.call_count == 2
+    
+    def test_tesserocr_hocr_is_full_document(self, mock_pytesseract, mock_api_cls):
+        """Test that hOCR with tesserocr enabled is the same complete document pytesseract returns"""
+        document = (
+            b'<?xml version="1.0" encoding="UTF-8"?>\n'
+            b'<html xmlns="http://www.w3.org/1999/xhtml">\n <head>\n  <title></title>\n </head>\n'
+            b" <body>\n  <div class='ocr_page'>hOCR</div>\n </body>\n</html>\n"
+        )
+        mock_pytesseract.image_to_pdf_or_hocr.return_value = document
+        mock_api_cls.return_value.GetHOCRText.return_value = "  <div class='ocr_page'>hOCR</div>\n"
+        mock_img = _mock_pil_image()
+        
+        result = OCREngine(use_tesserocr=True).process_pil_image(mock_img, output_format="hocr")
+        
+        # Assertions
+        assert result.startswith(b'<?xml')
+        assert b'<html' in result and result.rstrip().endswith(b'</html>')
+        mock_api_cls.return_value.GetHOCRText.assert_not_called()
+    
+    @pytest.mark.parametrize("max_workers", [1, 2, 4])
+    def test_process_images_batch(self, mock_api_cls, mock_os, max_workers):
+        """Test batch processing keeps input order and reuses one API per worker"""
+        # Each API echoes back the path it was given
+        def make_api(lang, oem=None):
+            api = MagicMock()
+            api.SetImageFile.side_effect = lambda img: setattr(api, 'image', img)
+            api.GetUTF8Text.side_effect = lambda: f"text of {api.image}"
+            return api
+        
+        mock_api_cls.side_effect = make_api
+        paths = [f"page_{i}.png" for i in range(12)]
+        
+        ocr_engine = OCREngine(use_tesserocr=True)
+        results = ocr_engine.process_images(paths, max_workers=max_workers)
+        
+        # Assertions
+        assert results == [f"text of {path}" for path in paths]
+        assert mock_api_cls.call_count <= max_workers
+    
+    def test_process_images_repeated_batches_reuse_apis(self, mock_api_cls, mock_os):
+        """Test that repeated batches reuse the worker threads and their tesserocr APIs"""
+        created = []
+        
+        def make_api(lang, oem=None):
+            api = MagicMock()
+            created.append(api)
+            return api
+        
+        mock_api_cls.side_effect = make_api
+        paths = [f"page_{i}.png" for i in range(8)]
+        
+        ocr_engine = OCREngine(use_tesserocr=True)
+        for _ in range(5):
+            ocr_engine.process_images(paths, max_workers=4)
+        
+        # Assertions
+        assert 0 < len(created) <= 4
+        ocr_engine.close()
+        for api in created:
+            api.End.assert_called_once()
+    
+    def test_process_images_mp(self, ocr_engine, mock_pytesseract, mock_os, monkeypatch):
+        """Test that process-pool batches run every path through the worker function in order"""
+        # Run the "pool" in this process so the pytesseract mock is visible
+        mock_pool = MagicMock()
+        mock_pool.map.side_effect = lambda func, jobs, chunksize: [func(job) for job in jobs]
+        monkeypatch.setattr(OCREngine, '_get_pool', MagicMock(return_value=mock_pool))
+        monkeypatch.setattr(ocr_engine_module, '_worker_engine', ocr_engine)
+        mock_pytesseract.image_to_string.side_effect = lambda path, lang, config: f"text of {path}"
+        paths = [f"page_{i}.png" for i in range(6)]
+        
+        results = ocr_engine.process_images_mp(paths, lang="deu")
+        
+        # Assertions
+        assert results == [f"text of {path}" for path in paths]
+        mock_pytesseract.image_to_string.assert_any_call("page_0.png", lang="deu", config="--oem 1 --psm 6")
+        
+        # Unsupported formats are rejected before reaching the pool
+        with pytest.raises(ValueError):
+            ocr_engine.process_images_mp(paths, output_format="invalid_format")
+        mock_pool.map.assert_called_once()
+    
+    def test_process_image_list_batches(self, ocr_engine, mock_pytesseract):
+        """Test that long image lists are split into tesseract runs of at most 50 paths"""
+        batch_sizes = []
+        
+        def fake_image_to_string(list_path, lang, config):
+            with open(list_path) as f:
+                batch_sizes.append(len(f.read().splitlines()))
+            return "page\f"
+        
+        mock_pytesseract.image_to_string.side_effect = fake_image_to_string
+        paths = [f"scan_{i}.png" for i in range(120)]
+        
+        result = ocr_engine.process_image_list(paths)
+        
+        # Assertions
+        assert mock_pytesseract.image_to_string.call_count == 3
+        for call in mock_pytesseract.image_to_string.call_args_list:
+            assert call.args[0].endswith('.txt')
+        assert batch_sizes == [50, 50, 20]
+        assert result == "page\f" * 3
+    
+    def test_close_ends_api(self, mock_api_cls):
+        """Test that close() ends every tesserocr API the engine created"""
+        ocr_engine = OCREngine(use_tesserocr=True)
+        ocr_engine.process_pil_image(_mock_pil_image())
+        
+        ocr_engine.close()
+        ocr_engine.close()
+        
+        # Assertions
+        mock_api_cls.return_value.End.assert_called_once()
+    
+    def test_context_manager(self, mock_api_cls):
+        """Test that leaving a with block ends the tesserocr API"""
+        with OCREngine(use_tesserocr=True) as ocr_engine:
+            ocr_engine.process_pil_image(_mock_pil_image())
+            mock_api_cls.return_value.End.assert_not_called()
+        
+        # Assertions
+        mock_api_cls.return_value.End.assert_called_once()
+    
+    def test_process_image_async(self, ocr_engine, mock_pytesseract, mock_os):
+        """Test that the async wrappers return the same results as the sync methods"""
+        mock_pytesseract.image_to_string.return_value = "Async OCR Text"
+        mock_img = _mock_pil_image()
+        
+        async def run():
+            return (
+                await ocr_engine.process_image_async("dummy_path.jpg", lang="eng"),
+                await ocr_engine.process_pil_image_async(mock_img, lang="eng")
+            )
+        
+        # Assertions
+        assert asyncio.run(run()) == ("Async OCR Text", "Async OCR Text")
+        mock_pytesseract.image_to_string.assert_any_call(
+            "dummy_path.jpg", lang="eng", config="--oem 1 --psm 6"
+        )
+        mock_pytesseract.image_to_string.assert_any_call(
+            mock_img, lang="eng", config="--oem 1 --psm 6"
+        )
+    
+    def test_process_image_async_concurrent(self, ocr_engine, mock_pytesseract, mock_os):
+        """Test that concurrent async calls overlap instead of running one after another"""
+        delay = 0.05
+        calls = 16
+        
+        def slow_image_to_string(image, lang, config):
+            time.sleep(delay)
+            return "text"
+        
+        mock_pytesseract.image_to_string.side_effect = slow_image_to_string
+        
+        async def run():
+            return await asyncio.gather(*(
+                ocr_engine.process_image_async(f"page_{i}.png") for i in range(calls)
+            ))
+        
+        start = time.perf_counter()
+        results = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+        
+        # Assertions
+        assert results == ["text"] * calls
+        assert elapsed < calls * delay
+    
+    @pytest.fixture
+    def image_file(self, tmp_path):
+        """Small file standing in for an image on disk."""
+        path = tmp_path / "image.png"
+        path.write_bytes(b"fake image bytes")
+        return str(path)
+    
+    def test_process_image_cache_hit(self, mock_pytesseract, image_file):
+        """Test that a repeated image is served from the cache"""
+        mock_pytesseract.image_to_string.return_value = "Cached OCR Text"
+        
+        ocr_engine = OCREngine(cache_size=8)
+        first = ocr_engine.process_image(image_file)
+        second = ocr_engine.process_image(image_file)
+        
+        # Assertions
+        assert first == "Cached OCR Text"
+        assert second == "Cached OCR Text"
+        mock_pytesseract.image_to_string.assert_called_once()
+    
+    def test_process_image_cache_hit_skips_max_pixels_check(self, mock_pytesseract, mock_image, image_file):
+        """Test that a cache hit does not open the image to check its size"""
+        mock_image.open.return_value.size = (100, 100)
+        
+        ocr_engine = OCREngine(cache_size=8, max_pixels=1000000)
+        ocr_engine.process_image(image_file)
+        ocr_engine.process_image(image_file)
+        
+        # Assertions
+        mock_image.open.assert_called_once_with(image_file)
+        mock_pytesseract.image_to_string.assert_called_once()
+    
+    def test_process_image_cache_hit_skips_preprocess(self, mock_pytesseract, mock_image, image_file):
+        """Test that a cache hit with preprocess=True does not run OpenCV again"""
+        mock_cv2 = MagicMock()
+        mock_cv2.threshold.return_value = (127, MagicMock())
+        mock_image.open.return_value.size = (100, 100)
+        
+        ocr_engine = OCREngine(cache_size=8, max_pixels=1000000)
+        with patch.dict(sys.modules, {'cv2': mock_cv2}):
+            ocr_engine.process_image(image_file, preprocess=True)
+            mock_cv2.reset_mock()
+            mock_image.open.reset_mock()
+            
+            ocr_engine.process_image(image_file, preprocess=True)
+        
+        # Assertions
+        assert mock_cv2.mock_calls == []
+        mock_image.open.assert_not_called()
+        mock_pytesseract.image_to_string.assert_called_once()
+    
+    def test_cache_invalidates_on_lang_change(self, mock_pytesseract, image_file):
+        """Test that changing the language bypasses the cached result"""
+        ocr_engine = OCREngine(cache_size=8)
+        ocr_engine.process_image(image_file, lang="eng")
+        ocr_engine.process_image(image_file, lang="fra")
+        
+        # Assertions
+        assert mock_pytesseract.image_to_string.call_count == 2
 
 
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    sys.exit(pytest.main([__file__]))
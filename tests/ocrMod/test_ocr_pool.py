@@ -0,0 +1,59 @@
+"""
+Tests for OCREngine.process_images_mp with real worker processes
+"""
+
+import sys
+import pytest
+import pytesseract
+from PIL import Image
+
+from src.ocrMod.ocr_engine import OCREngine
+
+# Stand-in for the tesseract executable. Worker processes cannot see mocks,
+# so this writes the output file pytesseract reads back, reporting the size
+# of the image it was given and its remaining arguments.
+_FAKE_TESSERACT = '''#!{python}
+import sys
+from PIL import Image
+
+image_path, output_base = sys.argv[1:3]
+with Image.open(image_path) as image:
+    width, height = image.size
+with open(output_base + ".txt", "w") as f:
+    f.write(f"{{width}}x{{height}} " + " ".join(sys.argv[3:]))
+'''
+
+
+@pytest.fixture
+def fake_tesseract(tmp_path):
+    """Write the fake tesseract executable and return its path."""
+    path = tmp_path / "tesseract"
+    path.write_text(_FAKE_TESSERACT.format(python=sys.executable))
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="fake tesseract is a shebang script")
+def test_process_images_mp_real_pool(fake_tesseract, tmp_path, monkeypatch):
+    """Test that spawned workers use the engine's tesseract_cmd and max_pixels"""
+    small = tmp_path / "small.png"
+    large = tmp_path / "large.png"
+    Image.new('L', (40, 30), 255).save(small)
+    Image.new('L', (400, 300), 255).save(large)
+
+    # The engine sets the global tesseract_cmd; point it elsewhere afterwards
+    # to check the workers got the engine's own setting
+    monkeypatch.setattr(pytesseract.pytesseract, 'tesseract_cmd', 'tesseract')
+    ocr_engine = OCREngine(tesseract_cmd=fake_tesseract, max_pixels=1200)
+    pytesseract.pytesseract.tesseract_cmd = 'missing-tesseract'
+
+    with ocr_engine:
+        results = ocr_engine.process_images_mp([str(small), str(large)], lang="deu", max_workers=2)
+
+    # Assertions
+    # The large image was downsampled to the 1200 pixel budget in the worker
+    assert results == ["40x30 -l deu --oem 1 --psm 6 txt"] * 2
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))